@@ -14,6 +14,9 @@ import datetime
 import json
 from typing import Dict, List, Optional
 
+# Indicadores mock (ASCII): se buscan sobre bytes en minúsculas, sin decodificar
+_MOCK_KEYWORDS = (b'mock', b'placeholder', b'todo', b'fixme')
+
 class StarkLauncher:
     """Dashboard de control principal del sistema STARK"""
     
@@ -377,9 +380,10 @@ class StarkLauncher:
                 for file_path in self.root_path.rglob("*.py"):
                     total_files += 1
                     try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
+                        # bytes.lower() solo pliega ASCII: más rápido que decodificar y usar str.lower()
+                        with open(file_path, 'rb') as f:
                             content = f.read().lower()
-                            if any(indicator in content for indicator in ['mock', 'placeholder', 'todo', 'fixme']):
+                            if any(indicator in content for indicator in _MOCK_KEYWORDS):
                                 mock_files += 1
                     except:
                         continue
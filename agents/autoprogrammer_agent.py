@@ -15,9 +15,9 @@ import ast
 import hashlib
 
 # Asegurar que el workspace está en el path
-workspace_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if workspace_path not in sys.path:
-    sys.path.insert(0, workspace_path)
+_WORKSPACE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _WORKSPACE_PATH not in sys.path:
+    sys.path.insert(0, _WORKSPACE_PATH)
 
 try:
     from agents.autoprogrammer_coordinator import AutoprogrammerCoordinator
@@ -25,6 +25,21 @@ except ImportError as e:
     print(f"⚠️ Error importando coordinador: {e}")
     AutoprogrammerCoordinator = None
 
+# Nodos que suman un camino a la complejidad ciclomática
+_BRANCH_NODES = (ast.If, ast.While, ast.For, ast.Try, ast.ExceptHandler)
+
+# Indicadores de implementación mock y parámetros de lectura por bloques
+_MOCK_INDICATORS = (
+    "pass  # TODO",
+    "# Mock implementation",
+    "raise NotImplementedError",
+    "return None  # Mock",
+    "# Placeholder",
+    "TODO: Implement"
+)
+_MOCK_INDICATOR_OVERLAP = max(len(indicator) for indicator in _MOCK_INDICATORS) - 1
+_READ_CHUNK_SIZE = 64 * 1024
+
 class StarkAutoprogrammerAgent:
     """
     Agente principal de autoprogramación para sistema JARVIS-FRIDAY V3.0
@@ -34,7 +49,7 @@ class StarkAutoprogrammerAgent:
     
     def __init__(self, workspace_path: str = None):
         if workspace_path is None:
-            workspace_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            workspace_path = _WORKSPACE_PATH  # Calculado una sola vez al importar el módulo
         
         self.workspace_path = workspace_path
         self.version = "3.0.0"
@@ -103,14 +118,15 @@ class StarkAutoprogrammerAgent:
             with open(current_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Analizar AST para métricas de código
+            # Analizar AST para métricas de código (un solo recorrido del árbol)
             tree = ast.parse(content)
+            functions_count, classes_count, complexity_score = self._collect_ast_metrics(tree)
             
             code_metrics = {
-                "functions_count": len([node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]),
-                "classes_count": len([node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]),
-                "lines_count": len(content.splitlines()),
-                "complexity_score": self._calculate_complexity(tree),
+                "functions_count": functions_count,
+                "classes_count": classes_count,
+                "lines_count": content.count('\n') + (0 if not content or content.endswith('\n') else 1),
+                "complexity_score": complexity_score,
                 "optimization_opportunities": self._identify_optimization_opportunities(content)
             }
             
@@ -132,13 +148,18 @@ class StarkAutoprogrammerAgent:
         except Exception as e:
             print(f"⚠️ Error analizando código propio: {e}")
     
-    def _calculate_complexity(self, tree: ast.AST) -> int:
-        """Calcula complejidad ciclomática básica"""
+    def _collect_ast_metrics(self, tree: ast.AST) -> Tuple[int, int, int]:
+        """Cuenta funciones, clases y complejidad ciclomática básica en un solo recorrido"""
+        functions = classes = 0
         complexity = 1
         for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.Try, ast.ExceptHandler)):
+            if isinstance(node, ast.FunctionDef):
+                functions += 1
+            elif isinstance(node, ast.ClassDef):
+                classes += 1
+            elif isinstance(node, _BRANCH_NODES):
                 complexity += 1
-        return complexity
+        return functions, classes, complexity
     
     def _identify_optimization_opportunities(self, code: str) -> List[str]:
         """Identifica oportunidades de optimización en el código"""
@@ -535,23 +556,23 @@ class StarkAutoprogrammerAgent:
         """Verifica si un archivo contiene implementación mock"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Indicadores de implementación mock
-            mock_indicators = [
-                "pass  # TODO",
-                "# Mock implementation", 
-                "raise NotImplementedError",
-                "return None  # Mock",
-                "# Placeholder",
-                "TODO: Implement"
-            ]
-            
-            # Si es muy pequeño y solo tiene pass, probablemente es mock
-            if len(content.strip()) < 100 and "pass" in content:
-                return True
+                chunk = f.read(_READ_CHUNK_SIZE)
+                
+                # Si es muy pequeño (cabe en el primer bloque) y solo tiene pass, probablemente es mock
+                if len(chunk) < _READ_CHUNK_SIZE and len(chunk.strip()) < 100 and "pass" in chunk:
+                    return True
                 
-            return any(indicator in content for indicator in mock_indicators)
+                # Leer por bloques y salir en cuanto aparezca un indicador; se conserva
+                # el final del bloque anterior para no perder coincidencias entre bloques
+                tail = ""
+                while chunk:
+                    window = tail + chunk
+                    if any(indicator in window for indicator in _MOCK_INDICATORS):
+                        return True
+                    tail = window[-_MOCK_INDICATOR_OVERLAP:]
+                    chunk = f.read(_READ_CHUNK_SIZE)
+            
+            return False
         except:
             return True
     
@@ -599,15 +620,16 @@ class StarkAutoprogrammerAgent:
                 with open(state_file, 'r', encoding='utf-8') as f:
                     state = json.load(f)
                 
-                # Actualizar timestamp
-                state["last_updated"] = datetime.now().isoformat()
+                # Actualizar timestamp (uno solo para toda la actualización)
+                timestamp = datetime.now().isoformat()
+                state["last_updated"] = timestamp
                 
                 # Añadir historial de conversión
                 if "conversion_history" not in state:
                     state["conversion_history"] = []
                 
                 state["conversion_history"].append({
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": timestamp,
                     "agent_version": self.version,
                     "completed": conversion_results.get("completed", []),
                     "failed": conversion_results.get("failed", [])
@@ -632,7 +654,8 @@ class StarkAutoprogrammerAgent:
         else:
             print("❌ Coordinador no disponible para conversión masiva")
             return {"error": "Coordinator not available"}
-      def get_quick_status(self) -> Dict[str, Any]:
+    
+    def get_quick_status(self) -> Dict[str, Any]:
         """Obtiene estado rápido del agente incluyendo capacidades de evolución"""
         mock_components = self._identify_mock_components()
         
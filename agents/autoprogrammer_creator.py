@@ -29,33 +29,19 @@ class StarkAutoprogrammerCreator:
             print(f"Error inicializando {self.__class__.__name__}: {e}")
             return False
     
-    async def process(self, data: Any) -> Any:
+    def process(self, data: Any) -> Any:
         """
         Método principal de procesamiento
         """
-        if not self.initialized:
-            await self.initialize()
-        
-        try:
-            # TODO: Implementar process
-            raise NotImplementedError(f"{self.__class__.__name__}.process needs implementation")
-        except Exception as e:
-            print(f"Error en process: {e}")
-            return None
+        # TODO: Implementar process
+        raise NotImplementedError(f"{self.__class__.__name__}.process needs implementation")
     
-    async def get_status(self) -> Dict[str, Any]:
+    def get_status(self) -> Dict[str, Any]:
         """
         Obtiene el estado actual del componente
         """
-        if not self.initialized:
-            await self.initialize()
-        
-        try:
-            # TODO: Implementar get_status
-            raise NotImplementedError(f"{self.__class__.__name__}.get_status needs implementation")
-        except Exception as e:
-            print(f"Error en get_status: {e}")
-            return {}
+        # TODO: Implementar get_status
+        raise NotImplementedError(f"{self.__class__.__name__}.get_status needs implementation")
     
 
 # Ejemplo de uso
@@ -4,12 +4,107 @@ Optimización inteligente de código para máximo rendimiento
 """
 
 import os
+import sys
 import ast
 import re
 import asyncio
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import subprocess
+import mmap
+
+# Patrones auxiliares precompilados (evitan la caché interna de re en cada llamada).
+# '\b' ancla los identificadores: re no reintenta desde cada posición interna de una palabra
+_WILDCARD_MODULE_RE = re.compile(r'from\s+(\w+)')
+_LIST_COMP_RE = re.compile(
+    r'\b(\w+)\s*=\s*\[\]\s*\n\s*for\s+(\w+)\s+in\s+(.*?):\s*\n\s*\1\.append\((.*?)\)',
+    re.MULTILINE | re.DOTALL
+)
+_STRING_CONCAT_RE = re.compile(
+    r'\b(\w+)\s*=\s*["\'].*?["\']\s*\n(?:\s*\1\s*\+=\s*["\'].*?["\']\s*\n)+',
+    re.MULTILINE
+)
+_STRING_PART_RE = re.compile(r'["\']([^"\']*)["\']')
+_ASSIGN_NAME_RE = re.compile(r'(\w+)\s*=')
+_SLEEP_DURATION_RE = re.compile(r'time\.sleep\((.*?)\)')
+
+# Clasificación de imports (PEP 8): lista completa del intérprete (Python 3.10+),
+# con una selección de módulos comunes como respaldo en versiones anteriores
+_STDLIB_MODULES = getattr(sys, 'stdlib_module_names', None) or frozenset({
+    'os', 'sys', 'json', 'time', 'datetime', 'collections', 
+    'itertools', 'functools', 'operator', 're', 'math', 
+    'random', 'string', 'io', 'pathlib', 'asyncio',
+    'typing', 'logging', 'ast', 'mmap', 'subprocess', 'dataclasses',
+    'enum', 'hashlib', 'concurrent', 'threading', 'shutil', 'tempfile',
+    'traceback', 'inspect', 'copy', 'pickle', 'struct', 'weakref',
+    'contextlib', 'abc', 'uuid', 'glob', 'argparse', 'textwrap'
+})
+_LOCAL_IMPORT_PREFIXES = ('from .', 'from agents', 'from neural')
+
+# Nombres habituales por módulo para resolver imports con wildcard,
+# con una única alternancia precompilada por módulo (límites de palabra)
+_MODULE_COMMON_NAMES = {
+    'os': ['path', 'listdir', 'makedirs', 'environ'],
+    'sys': ['argv', 'exit', 'path'],
+    'json': ['loads', 'dumps', 'load', 'dump'],
+    'time': ['sleep', 'time', 'strftime'],
+    'datetime': ['datetime', 'date', 'time']
+}
+_MODULE_NAME_PATTERNS = {
+    module: re.compile(r'\b(?:' + '|'.join(map(re.escape, names)) + r')\b')
+    for module, names in _MODULE_COMMON_NAMES.items()
+}
+
+# Ganancia estimada (%) por tipo de optimización; 5% por defecto
+_GAIN_MAP = {
+    'imports.wildcard_imports': 5,
+    'imports.unused_imports': 10,
+    'performance.list_comprehensions': 15,
+    'performance.string_concatenation': 20,
+    'memory.generator_expressions': 25,
+    'async.blocking_calls': 30
+}
+_MAX_GAIN = 85
+
+# Por encima de este tamaño el fuente se decodifica desde un mmap
+_MMAP_THRESHOLD = 1024 * 1024
+
+@lru_cache(maxsize=64)
+def _parse_source(content: str) -> ast.AST:
+    """Parsea el código una sola vez por contenido (memoizado).
+    
+    Todas las pasadas del optimizador comparten este árbol: solo se vuelve a
+    parsear cuando una optimización modificó el contenido. No mutar el AST.
+    """
+    return ast.parse(content)
+
+
+def _optimize_file_in_process(config: Tuple[str, str, int, Dict[str, Dict[str, Dict[str, Any]]]],
+                              file_path: str, optimization_type: str, backup_seq: int) -> str:
+    """Optimiza un archivo dentro de un proceso worker (evita el GIL en lotes).
+    
+    config es CodeOptimizer._worker_config() del optimizador que lanza el lote;
+    backup_seq es el número de backup reservado para este archivo en ese optimizador.
+    """
+    workspace_path, run_timestamp, run_id, patterns = config
+    optimizer = CodeOptimizer(workspace_path)
+    optimizer.run_timestamp = run_timestamp
+    optimizer._run_id = run_id
+    optimizer._backup_counter = itertools.count(backup_seq)
+    # Las fixes viajan por nombre y se vuelven a ligar al optimizador del worker
+    optimizer.optimization_patterns = {
+        category: {
+            name: {**opt_config, 'fix': getattr(optimizer, opt_config['fix'])}
+            for name, opt_config in entries.items()
+        }
+        for category, entries in patterns.items()
+    }
+    return asyncio.run(optimizer.optimize_code(file_path, optimization_type))
+
 
 class CodeOptimizer:
     """Optimizador inteligente de código Python"""
@@ -17,21 +112,29 @@ class CodeOptimizer:
     def __init__(self, workspace_path: str):
         self.workspace_path = workspace_path
         
-        # Patrones de optimización
+        # Un único reloj por ejecución: backups únicos sin datetime.now() por archivo
+        self.run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._run_id = time.monotonic_ns()
+        self._backup_counter = itertools.count()
+        
+        # Patrones de optimización ('triggers': subcadenas imprescindibles para que aplique)
         self.optimization_patterns = {
             'imports': {
                 'wildcard_imports': {
                     'pattern': r'from\s+\w+\s+import\s+\*',
+                    'triggers': ('import', '*'),
                     'fix': self.fix_wildcard_imports,
                     'description': 'Reemplazar imports con wildcard por imports específicos'
                 },
                 'unused_imports': {
                     'pattern': None,  # Requires AST analysis
+                    'triggers': ('import',),
                     'fix': self.remove_unused_imports,
                     'description': 'Eliminar imports no utilizados'
                 },
                 'import_order': {
                     'pattern': None,  # Requires analysis
+                    'triggers': ('import',),
                     'fix': self.optimize_import_order,
                     'description': 'Ordenar imports según PEP 8'
                 }
@@ -39,16 +142,19 @@ class CodeOptimizer:
             'performance': {
                 'list_comprehensions': {
                     'pattern': r'for\s+\w+\s+in\s+.*:\s*\n\s*.*\.append\(',
+                    'triggers': ('.append(',),
                     'fix': self.convert_to_list_comprehension,
                     'description': 'Convertir loops a list comprehensions'
                 },
                 'string_concatenation': {
-                    'pattern': r'\w+\s*\+=\s*["\'].*["\']',
+                    'pattern': r'\b\w+\s*\+=\s*["\'].*["\']',
+                    'triggers': ('+=',),
                     'fix': self.optimize_string_concatenation,
                     'description': 'Optimizar concatenación de strings'
                 },
                 'inefficient_loops': {
                     'pattern': r'for\s+\w+\s+in\s+range\(len\(',
+                    'triggers': ('range(len(',),
                     'fix': self.optimize_range_loops,
                     'description': 'Optimizar loops con range(len())'
                 }
@@ -56,6 +162,7 @@ class CodeOptimizer:
             'memory': {
                 'generator_expressions': {
                     'pattern': r'sum\(\[.*for.*\]\)',
+                    'triggers': ('sum([',),
                     'fix': self.convert_to_generators,
                     'description': 'Convertir a generator expressions'
                 },
@@ -68,6 +175,7 @@ class CodeOptimizer:
             'async': {
                 'blocking_calls': {
                     'pattern': r'time\.sleep\(',
+                    'triggers': ('time.sleep(',),
                     'fix': self.convert_to_async_sleep,
                     'description': 'Convertir time.sleep a asyncio.sleep'
                 },
@@ -80,6 +188,7 @@ class CodeOptimizer:
             'error_handling': {
                 'bare_except': {
                     'pattern': r'except\s*:',
+                    'triggers': ('except',),
                     'fix': self.fix_bare_except,
                     'description': 'Reemplazar bare except con excepción específica'
                 },
@@ -90,6 +199,12 @@ class CodeOptimizer:
                 }
             }
         }
+        
+        # Precompilar los patrones regex una sola vez
+        for patterns in self.optimization_patterns.values():
+            for opt_config in patterns.values():
+                if opt_config['pattern']:
+                    opt_config['pattern'] = re.compile(opt_config['pattern'], re.MULTILINE)
     
     async def optimize_code(self, file_path: str, optimization_type: str = "all") -> str:
         """Optimiza código en un archivo específico"""
@@ -99,55 +214,32 @@ class CodeOptimizer:
             return f"❌ Archivo no encontrado: {file_path}"
         
         try:
-            # Leer archivo original
-            with open(full_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
+            # Leer archivo original (fuera del event loop)
+            original_content = await asyncio.to_thread(self._read_source, full_path)
             
-            # Crear backup
-            backup_path = f"{full_path}.optimized_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(original_content)
+            # Trabajo CPU (parseo, regex, AST) en un hilo para no bloquear el event loop
+            result = await asyncio.to_thread(
+                self._optimize_cpu, original_content, file_path, optimization_type
+            )
+            if 'error' in result:
+                return result['error']
             
-            # Realizar análisis sintáctico
-            syntax_analysis = await self.analyze_syntax(original_content)
-            if not syntax_analysis['valid']:
-                return f"❌ Error de sintaxis en {file_path}: {syntax_analysis['error']}"
+            optimizations_applied = result['applied']
             
-            # Realizar optimizaciones
-            optimized_content = original_content
-            optimizations_applied = []
+            # Sin cambios: no se crea backup ni se reescribe el archivo
+            if not optimizations_applied:
+                return f"✅ Sin optimizaciones necesarias: {file_path}"
             
-            if optimization_type == "all":
-                for category in self.optimization_patterns:
-                    result = await self.apply_category_optimizations(
-                        optimized_content, category, file_path
-                    )
-                    optimized_content = result['content']
-                    optimizations_applied.extend(result['applied'])
-            else:
-                # Optimización específica
-                if optimization_type in self.optimization_patterns:
-                    result = await self.apply_category_optimizations(
-                        optimized_content, optimization_type, file_path
-                    )
-                    optimized_content = result['content']
-                    optimizations_applied.extend(result['applied'])
-            
-            # Verificar que las optimizaciones no rompieron el código
-            final_syntax = await self.analyze_syntax(optimized_content)
-            if not final_syntax['valid']:
-                return f"❌ Las optimizaciones causaron errores de sintaxis: {final_syntax['error']}"
+            optimized_content = result['content']
             
-            # Agregar comentario de optimización
-            optimization_header = self.generate_optimization_header(optimizations_applied)
-            optimized_content = optimization_header + optimized_content
-            
-            # Escribir archivo optimizado
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(optimized_content)
+            # Crear backup (solo cuando hay cambios que escribir) y escribir archivo optimizado
+            backup_path = f"{full_path}.optimized_backup_{self._run_id}_{next(self._backup_counter):06d}"
+            await asyncio.to_thread(
+                self._write_optimized, full_path, backup_path, original_content, optimized_content
+            )
             
             # Generar reporte de optimización
-            performance_gain = await self.estimate_performance_gain(optimizations_applied)
+            performance_gain = self.estimate_performance_gain(optimizations_applied)
             
             return f"""✅ Optimización completada: {file_path}
 📊 Optimizaciones aplicadas: {len(optimizations_applied)}
@@ -158,11 +250,109 @@ class CodeOptimizer:
         except Exception as e:
             return f"❌ Error optimizando {file_path}: {str(e)}"
     
-    async def analyze_syntax(self, content: str) -> Dict[str, Any]:
+    def _optimize_cpu(self, original_content: str, file_path: str, optimization_type: str) -> Dict[str, Any]:
+        """Parte CPU de optimize_code: análisis, optimizaciones y validación final"""
+        # Realizar análisis sintáctico
+        syntax_analysis = self.analyze_syntax(original_content)
+        if not syntax_analysis['valid']:
+            return {'error': f"❌ Error de sintaxis en {file_path}: {syntax_analysis['error']}"}
+        
+        # Realizar optimizaciones
+        optimized_content = original_content
+        optimizations_applied = []
+        
+        if optimization_type == "all":
+            categories = list(self.optimization_patterns)
+        elif optimization_type in self.optimization_patterns:
+            # Optimización específica
+            categories = [optimization_type]
+        else:
+            categories = []
+        
+        for category in categories:
+            result = self.apply_category_optimizations(optimized_content, category, file_path)
+            optimized_content = result['content']
+            optimizations_applied.extend(result['applied'])
+        
+        # Nada cambió: el contenido ya fue validado, se omite el ast.parse final
+        if not optimizations_applied:
+            return {'content': original_content, 'applied': []}
+        
+        # Verificar que las optimizaciones no rompieron el código
+        final_syntax = self.analyze_syntax(optimized_content)
+        if not final_syntax['valid']:
+            return {'error': f"❌ Las optimizaciones causaron errores de sintaxis: {final_syntax['error']}"}
+        
+        # Agregar comentario de optimización
+        optimization_header = self.generate_optimization_header(optimizations_applied)
+        return {'content': optimization_header + optimized_content, 'applied': optimizations_applied}
+    
+    def _write_optimized(self, full_path: str, backup_path: str, original_content: str, optimized_content: str):
+        """Escribe backup y archivo optimizado"""
+        self._write_source(backup_path, original_content)
+        self._write_source(full_path, optimized_content)
+    
+    async def optimize_files(self, file_paths: List[str], optimization_type: str = "all",
+                             max_workers: Optional[int] = None) -> List[str]:
+        """Optimiza varios archivos en paralelo con un pool de procesos compartido"""
+        if not file_paths:
+            return []
+        
+        workers = max_workers or min(len(file_paths), os.cpu_count() or 1)
+        loop = asyncio.get_running_loop()
+        config = self._worker_config()
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tasks = [
+                loop.run_in_executor(
+                    executor, _optimize_file_in_process,
+                    config, file_path, optimization_type, next(self._backup_counter)
+                )
+                for file_path in file_paths
+            ]
+            return list(await asyncio.gather(*tasks))
+    
+    def _worker_config(self) -> Tuple[str, str, int, Dict[str, Dict[str, Dict[str, Any]]]]:
+        """Configuración serializable para reconstruir este optimizador en un proceso worker"""
+        patterns = {
+            category: {
+                name: {**opt_config, 'fix': opt_config['fix'].__name__}
+                for name, opt_config in entries.items()
+            }
+            for category, entries in self.optimization_patterns.items()
+        }
+        return (self.workspace_path, self.run_timestamp, self._run_id, patterns)
+    
+    @staticmethod
+    def _read_source(full_path: str) -> str:
+        """Lee el contenido de un archivo fuente (binario + decode, mmap si es grande, newlines normalizados)"""
+        with open(full_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, 'utf-8')
+            else:
+                content = f.read().decode('utf-8')
+        # Equivalente a los universal newlines del modo texto
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    @staticmethod
+    def _write_source(full_path: str, content: str):
+        """Escribe el contenido codificado una sola vez, directo al descriptor"""
+        data = memoryview(content.encode('utf-8'))
+        fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+    
+    def analyze_syntax(self, content: str) -> Dict[str, Any]:
         """Analiza la sintaxis del código"""
         try:
-            ast.parse(content)
-            return {'valid': True, 'ast': ast.parse(content)}
+            tree = _parse_source(content)
+            return {'valid': True, 'ast': tree}
         except SyntaxError as e:
             return {
                 'valid': False,
@@ -173,7 +363,7 @@ class CodeOptimizer:
         except Exception as e:
             return {'valid': False, 'error': str(e)}
     
-    async def apply_category_optimizations(self, content: str, category: str, file_path: str) -> Dict[str, Any]:
+    def apply_category_optimizations(self, content: str, category: str, file_path: str) -> Dict[str, Any]:
         """Aplica optimizaciones de una categoría específica"""
         optimizations_applied = []
         optimized_content = content
@@ -184,17 +374,23 @@ class CodeOptimizer:
         patterns = self.optimization_patterns[category]
         
         for opt_name, opt_config in patterns.items():
+            # Filtro barato (memmem en C): sin las subcadenas necesarias no hay nada que optimizar
+            triggers = opt_config.get('triggers')
+            if triggers and not all(trigger in optimized_content for trigger in triggers):
+                continue
+            
             try:
                 if opt_config['pattern']:
                     # Optimización basada en regex
-                    result = await self.apply_regex_optimization(
+                    result = self.apply_regex_optimization(
                         optimized_content, opt_config, opt_name, category
                     )
                 else:
                     # Optimización basada en análisis
-                    result = await opt_config['fix'](optimized_content, file_path)
+                    result = opt_config['fix'](optimized_content, file_path)
                 
-                if result['modified']:
+                # Dirty tracking: solo cuenta si el contenido cambió de verdad
+                if result['modified'] and result['content'] != optimized_content:
                     optimized_content = result['content']
                     optimizations_applied.append({
                         'type': f"{category}.{opt_name}",
@@ -207,16 +403,21 @@ class CodeOptimizer:
         
         return {'content': optimized_content, 'applied': optimizations_applied}
     
-    async def apply_regex_optimization(self, content: str, opt_config: Dict, opt_name: str, category: str) -> Dict[str, Any]:
+    def apply_regex_optimization(self, content: str, opt_config: Dict, opt_name: str, category: str) -> Dict[str, Any]:
         """Aplica optimización basada en expresiones regulares"""
         pattern = opt_config['pattern']
-        matches = list(re.finditer(pattern, content, re.MULTILINE))
         
-        if not matches:
+        # Camino rápido: la mayoría de archivos no tiene ninguna coincidencia
+        first = pattern.search(content)
+        if first is None:
             return {'modified': False, 'content': content}
         
+        # Continuar desde la primera coincidencia sin volver a escanear el prefijo
+        matches = [first]
+        matches.extend(pattern.finditer(content, first.end()))
+        
         # Aplicar fix function
-        result = await opt_config['fix'](content, matches)
+        result = opt_config['fix'](content, matches)
         
         return {
             'modified': result.get('modified', False),
@@ -225,15 +426,17 @@ class CodeOptimizer:
         }
     
     # Funciones de optimización específicas
-    async def fix_wildcard_imports(self, content: str, matches: List) -> Dict[str, Any]:
+    def fix_wildcard_imports(self, content: str, matches: List) -> Dict[str, Any]:
         """Arregla imports con wildcard"""
-        optimized_content = content
+        # Ensamblar en una sola pasada (evita copias O(N·L) por slicing)
+        parts = []
+        last = 0
         
-        for match in reversed(matches):  # Procesar en reversa para mantener posiciones
+        for match in matches:
             wildcard_line = match.group(0)
             
             # Extraer módulo
-            module_match = re.search(r'from\s+(\w+)', wildcard_line)
+            module_match = _WILDCARD_MODULE_RE.search(wildcard_line)
             if module_match:
                 module_name = module_match.group(1)
                 
@@ -241,54 +444,48 @@ class CodeOptimizer:
                 used_names = self.find_used_names_from_module(content, module_name)
                 
                 if used_names:
-                    specific_import = f"from {module_name} import {', '.join(used_names)}"
-                    optimized_content = optimized_content[:match.start()] + specific_import + optimized_content[match.end():]
+                    parts.append(content[last:match.start()])
+                    parts.append(f"from {module_name} import {', '.join(used_names)}")
+                    last = match.end()
         
-        return {'modified': True, 'content': optimized_content}
+        parts.append(content[last:])
+        return {'modified': True, 'content': ''.join(parts)}
     
-    async def remove_unused_imports(self, content: str, file_path: str) -> Dict[str, Any]:
+    def remove_unused_imports(self, content: str, file_path: str) -> Dict[str, Any]:
         """Elimina imports no utilizados"""
         try:
-            tree = ast.parse(content)
+            tree = _parse_source(content)
             
-            # Encontrar todos los imports
+            # Un solo recorrido: sentencias import (con sus líneas) y nombres usados
             imports = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        for alias in node.names:
-                            imports.append(f"{node.module}.{alias.name}")
-            
-            # Encontrar nombres utilizados
             used_names = set()
+            # Despacho por identidad de tipo: más barato que la cadena de isinstance
             for node in ast.walk(tree):
-                if isinstance(node, ast.Name):
+                node_type = type(node)
+                if node_type is ast.Name:
                     used_names.add(node.id)
-                elif isinstance(node, ast.Attribute):
+                elif node_type is ast.Attribute:
                     # Manejar atributos como module.function
-                    if isinstance(node.value, ast.Name):
+                    if type(node.value) is ast.Name:
                         used_names.add(node.value.id)
+                elif node_type is ast.Import:
+                    bound = [alias.asname or alias.name.split('.', 1)[0] for alias in node.names]
+                    imports.append((node.lineno, node.end_lineno, bound))
+                elif node_type is ast.ImportFrom:
+                    if node.module and node.module != '__future__':
+                        bound = [alias.asname or alias.name for alias in node.names]
+                        imports.append((node.lineno, node.end_lineno, bound))
             
-            # Identificar imports no utilizados
-            unused_imports = [imp for imp in imports if not any(name in imp for name in used_names)]
+            # Líneas de sentencias cuyos nombres no se usan en absoluto
+            drop_linenos = set()
+            for start, end, bound in imports:
+                if '*' not in bound and not any(name in used_names for name in bound):
+                    drop_linenos.update(range(start, end + 1))
             
-            if unused_imports:
+            if drop_linenos:
                 # Eliminar imports no utilizados
                 lines = content.split('\n')
-                filtered_lines = []
-                
-                for line in lines:
-                    is_unused_import = False
-                    for unused in unused_imports:
-                        if f"import {unused}" in line or f"from {unused}" in line:
-                            is_unused_import = True
-                            break
-                    
-                    if not is_unused_import:
-                        filtered_lines.append(line)
+                filtered_lines = [line for i, line in enumerate(lines, start=1) if i not in drop_linenos]
                 
                 return {'modified': True, 'content': '\n'.join(filtered_lines)}
             
@@ -298,190 +495,191 @@ class CodeOptimizer:
             print(f"Error analizando imports: {e}")
             return {'modified': False, 'content': content}
     
-    async def optimize_import_order(self, content: str, file_path: str) -> Dict[str, Any]:
+    def optimize_import_order(self, content: str, file_path: str) -> Dict[str, Any]:
         """Ordena imports según PEP 8"""
-        lines = content.split('\n')
-        
-        # Separar imports, docstrings y código
-        imports = []
-        other_lines = []
-        in_import_section = True
+        try:
+            tree = _parse_source(content)
+        except SyntaxError:
+            return {'modified': False, 'content': content}
         
-        for line in lines:
-            stripped = line.strip()
-            
-            if stripped.startswith('import ') or stripped.startswith('from '):
-                if in_import_section:
-                    imports.append(line)
-                else:
-                    other_lines.append(line)
-            elif stripped == '' or stripped.startswith('#'):
-                if in_import_section:
-                    imports.append(line)
-                else:
-                    other_lines.append(line)
-            else:
-                in_import_section = False
-                other_lines.append(line)
+        # Bloque inicial de imports (tras el docstring del módulo, si existe)
+        body = tree.body
+        index = 0
+        if (body and isinstance(body[0], ast.Expr)
+                and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)):
+            index = 1
+        
+        import_nodes = []
+        for node in body[index:]:
+            if not isinstance(node, (ast.Import, ast.ImportFrom)):
+                break
+            import_nodes.append(node)
+        
+        if not import_nodes:
+            return {'modified': False, 'content': content}
         
-        if not imports:
+        # Sentencias que comparten línea (p.ej. 'import os; x = 1') no se pueden mover por slices
+        next_index = index + len(import_nodes)
+        boundaries = [node.lineno for node in import_nodes[1:]]
+        if next_index < len(body):
+            boundaries.append(body[next_index].lineno)
+        previous_ends = [node.end_lineno for node in import_nodes]
+        if any(start <= end for start, end in zip(boundaries, previous_ends)):
             return {'modified': False, 'content': content}
         
-        # Clasificar imports según PEP 8
+        lines = content.split('\n')
+        import_start = import_nodes[0].lineno - 1
+        import_end = import_nodes[-1].end_lineno
+        
+        # Clasificar imports según PEP 8 (solo el bloque de imports, no el cuerpo)
+        future_imports = []
         stdlib_imports = []
         third_party_imports = []
         local_imports = []
         
-        for imp in imports:
-            if imp.strip() == '' or imp.strip().startswith('#'):
-                continue
-                
-            if self.is_stdlib_import(imp):
-                stdlib_imports.append(imp)
-            elif self.is_local_import(imp):
-                local_imports.append(imp)
+        for node in import_nodes:
+            statement = '\n'.join(lines[node.lineno - 1:node.end_lineno])
+            
+            if isinstance(node, ast.ImportFrom) and node.module == '__future__':
+                future_imports.append(statement)
+            elif self.is_stdlib_import(statement):
+                stdlib_imports.append(statement)
+            elif self.is_local_import(statement):
+                local_imports.append(statement)
             else:
-                third_party_imports.append(imp)
-        
-        # Ordenar cada grupo
-        stdlib_imports.sort()
-        third_party_imports.sort()
-        local_imports.sort()
+                third_party_imports.append(statement)
         
-        # Reconstruir sección de imports
+        # Reconstruir sección de imports, grupos ordenados y separados por una línea vacía
         ordered_imports = []
-        if stdlib_imports:
-            ordered_imports.extend(stdlib_imports)
-            ordered_imports.append('')
-        if third_party_imports:
-            ordered_imports.extend(third_party_imports)
-            ordered_imports.append('')
-        if local_imports:
-            ordered_imports.extend(local_imports)
-            ordered_imports.append('')
-        
-        # Reconstruir contenido
-        if ordered_imports:
-            ordered_imports.pop()  # Eliminar última línea vacía
-        
-        optimized_content = '\n'.join(ordered_imports + other_lines)
-        
-        return {'modified': True, 'content': optimized_content}
+        for group in (future_imports, stdlib_imports, third_party_imports, local_imports):
+            if group:
+                group.sort()
+                ordered_imports.extend(group)
+                ordered_imports.append('')
+        ordered_imports.pop()  # Eliminar última línea vacía
+        
+        optimized_content = '\n'.join(lines[:import_start] + ordered_imports + lines[import_end:])
+        
+        return {'modified': optimized_content != content, 'content': optimized_content}
     
-    async def convert_to_list_comprehension(self, content: str, matches: List) -> Dict[str, Any]:
+    def convert_to_list_comprehension(self, content: str, matches: List) -> Dict[str, Any]:
         """Convierte loops a list comprehensions"""
-        optimized_content = content
-        
-        # Buscar patrones específicos de loops que se pueden optimizar
-        loop_pattern = re.compile(
-            r'(\w+)\s*=\s*\[\]\s*\n\s*for\s+(\w+)\s+in\s+(.*?):\s*\n\s*\1\.append\((.*?)\)',
-            re.MULTILINE | re.DOTALL
+        # Sustitución en una sola pasada de _sre con callback
+        optimized_content, changes = _LIST_COMP_RE.subn(
+            lambda m: f"{m[1]} = [{m[4]} for {m[2]} in {m[3]}]", content
         )
         
-        for match in reversed(list(loop_pattern.finditer(content))):
-            list_name, var_name, iterable, expression = match.groups()
-            
-            # Crear list comprehension
-            list_comp = f"{list_name} = [{expression} for {var_name} in {iterable}]"
-            
-            optimized_content = optimized_content[:match.start()] + list_comp + optimized_content[match.end():]
-        
-        return {'modified': True, 'content': optimized_content}
+        return {'modified': changes > 0, 'content': optimized_content, 'changes': changes}
     
-    async def optimize_string_concatenation(self, content: str, matches: List) -> Dict[str, Any]:
+    def optimize_string_concatenation(self, content: str, matches: List) -> Dict[str, Any]:
         """Optimiza concatenación de strings"""
-        # Detectar múltiples concatenaciones de strings
-        concat_pattern = re.compile(
-            r'(\w+)\s*=\s*["\'].*?["\']\s*\n(?:\s*\1\s*\+=\s*["\'].*?["\']\s*\n)+',
-            re.MULTILINE
-        )
-        
-        optimized_content = content
-        
-        for match in reversed(list(concat_pattern.finditer(content))):
+        def join_concatenation(match):
             concat_block = match.group(0)
             
             # Extraer strings
-            string_parts = re.findall(r'["\']([^"\']*)["\']', concat_block)
-            var_name = re.search(r'(\w+)\s*=', concat_block).group(1)            # Crear versión optimizada con join
-            if len(string_parts) > 2:
-                string_list = ", ".join([f'"{part}"' for part in string_parts])
-                optimized_concat = f'{var_name} = "".join([{string_list}])'
-                optimized_content = optimized_content[:match.start()] + optimized_concat + optimized_content[match.end():]
-        
-        return {'modified': True, 'content': optimized_content}
+            string_parts = _STRING_PART_RE.findall(concat_block)
+            if len(string_parts) <= 2:
+                return concat_block
+            
+            # Crear versión optimizada con join
+            var_name = _ASSIGN_NAME_RE.search(concat_block).group(1)
+            string_list = ", ".join([f'"{part}"' for part in string_parts])
+            # El bloque coincidente termina en '\n': conservarlo
+            return f'{var_name} = "".join([{string_list}])\n'
+        
+        # Detectar múltiples concatenaciones de strings en una sola pasada
+        optimized_content = _STRING_CONCAT_RE.sub(join_concatenation, content)
+        
+        return {'modified': optimized_content != content, 'content': optimized_content}
     
-    async def convert_to_async_sleep(self, content: str, matches: List) -> Dict[str, Any]:
+    def convert_to_async_sleep(self, content: str, matches: List) -> Dict[str, Any]:
         """Convierte time.sleep a asyncio.sleep"""
-        optimized_content = content
         needs_asyncio_import = 'import asyncio' not in content and 'from asyncio' not in content
         
-        for match in reversed(matches):
+        # Agregar import de asyncio si es necesario
+        parts = ["import asyncio\n"] if needs_asyncio_import and matches else []
+        last = 0
+        
+        for match in matches:
             sleep_call = match.group(0)
             
             # Extraer duración
-            duration_match = re.search(r'time\.sleep\((.*?)\)', sleep_call)
+            duration_match = _SLEEP_DURATION_RE.search(sleep_call)
             if duration_match:
-                duration = duration_match.group(1)
-                async_sleep = f"await asyncio.sleep({duration})"
-                optimized_content = optimized_content[:match.start()] + async_sleep + optimized_content[match.end():]
+                parts.append(content[last:match.start()])
+                parts.append(f"await asyncio.sleep({duration_match.group(1)})")
+                last = match.end()
         
-        # Agregar import de asyncio si es necesario
-        if needs_asyncio_import and matches:
-            import_line = "import asyncio\n"
-            optimized_content = import_line + optimized_content
-        
-        return {'modified': True, 'content': optimized_content}
+        parts.append(content[last:])
+        return {'modified': True, 'content': ''.join(parts)}
     
-    async def fix_bare_except(self, content: str, matches: List) -> Dict[str, Any]:
+    def fix_bare_except(self, content: str, matches: List) -> Dict[str, Any]:
         """Arregla bare except clauses"""
-        optimized_content = content
+        parts = []
+        last = 0
         
-        for match in reversed(matches):
-            bare_except = match.group(0)
-            specific_except = "except Exception:"
-            optimized_content = optimized_content[:match.start()] + specific_except + optimized_content[match.end():]
+        for match in matches:
+            parts.append(content[last:match.start()])
+            parts.append("except Exception:")
+            last = match.end()
         
-        return {'modified': True, 'content': optimized_content}
+        parts.append(content[last:])
+        return {'modified': True, 'content': ''.join(parts)}
+    
+    # Optimizaciones registradas sin reescritura automática todavía:
+    # se mantienen para que el catálogo de patrones sea instanciable
+    def optimize_range_loops(self, content: str, matches: List) -> Dict[str, Any]:
+        """Detecta loops range(len()) (sin reescritura automática)"""
+        return {'modified': False, 'content': content}
+    
+    def convert_to_generators(self, content: str, matches: List) -> Dict[str, Any]:
+        """Detecta sum([...]) convertibles a generator (sin reescritura automática)"""
+        return {'modified': False, 'content': content}
+    
+    def fix_memory_leaks(self, content: str, file_path: str) -> Dict[str, Any]:
+        """Análisis de memory leaks (sin reescritura automática)"""
+        return {'modified': False, 'content': content}
+    
+    def identify_async_opportunities(self, content: str, file_path: str) -> Dict[str, Any]:
+        """Análisis de oportunidades async (sin reescritura automática)"""
+        return {'modified': False, 'content': content}
+    
+    def add_missing_finally(self, content: str, file_path: str) -> Dict[str, Any]:
+        """Análisis de bloques finally (sin reescritura automática)"""
+        return {'modified': False, 'content': content}
     
     # Métodos auxiliares
     def find_used_names_from_module(self, content: str, module: str) -> List[str]:
         """Encuentra nombres utilizados de un módulo específico"""
-        # Implementación simplificada - buscar patrones comunes
-        common_names = {
-            'os': ['path', 'listdir', 'makedirs', 'environ'],
-            'sys': ['argv', 'exit', 'path'],
-            'json': ['loads', 'dumps', 'load', 'dump'],
-            'time': ['sleep', 'time', 'strftime'],
-            'datetime': ['datetime', 'date', 'time']
-        }
+        # Implementación simplificada - buscar patrones comunes en una sola pasada
+        pattern = _MODULE_NAME_PATTERNS.get(module)
+        if pattern is None:
+            return []
         
-        used = []
-        if module in common_names:
-            for name in common_names[module]:
-                if name in content:
-                    used.append(name)
+        found = set(pattern.findall(content))
+        used = [name for name in _MODULE_COMMON_NAMES[module] if name in found]
         
         return used[:5]  # Limitar a 5 imports más comunes
     
     def is_stdlib_import(self, import_line: str) -> bool:
         """Determina si un import es de la librería estándar"""
-        stdlib_modules = {
-            'os', 'sys', 'json', 'time', 'datetime', 'collections', 
-            'itertools', 'functools', 'operator', 're', 'math', 
-            'random', 'string', 'io', 'pathlib', 'asyncio'
-        }
-        
-        module_match = re.search(r'(?:from\s+|import\s+)(\w+)', import_line)
-        if module_match:
-            module = module_match.group(1)
-            return module in stdlib_modules
-        
-        return False
+        stripped = import_line.lstrip()
+        if stripped.startswith('from '):
+            rest = stripped[5:]
+        elif stripped.startswith('import '):
+            rest = stripped[7:]
+        else:
+            return False
+        
+        parts = rest.split(None, 1)
+        if not parts:
+            return False
+        return parts[0].split('.', 1)[0].rstrip(',') in _STDLIB_MODULES
     
     def is_local_import(self, import_line: str) -> bool:
         """Determina si un import es local (del proyecto)"""
-        return import_line.startswith('from .') or 'from agents' in import_line or 'from neural' in import_line
+        return import_line.lstrip().startswith(_LOCAL_IMPORT_PREFIXES)
     
     def generate_optimization_header(self, optimizations: List[Dict]) -> str:
         """Genera header con información de optimizaciones aplicadas"""
@@ -490,7 +688,7 @@ class CodeOptimizer:
         
         header = f"""
 # STARK AUTOPROGRAMMER - Optimizaciones aplicadas
-# Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+# Fecha: {self.run_timestamp}
 # Optimizaciones: {len(optimizations)}
 """
         
@@ -501,20 +699,7 @@ class CodeOptimizer:
         
         return header
     
-    async def estimate_performance_gain(self, optimizations: List[Dict]) -> int:
+    def estimate_performance_gain(self, optimizations: List[Dict]) -> int:
         """Estima ganancia de rendimiento basada en optimizaciones aplicadas"""
-        gain_map = {
-            'imports.wildcard_imports': 5,
-            'imports.unused_imports': 10,
-            'performance.list_comprehensions': 15,
-            'performance.string_concatenation': 20,
-            'memory.generator_expressions': 25,
-            'async.blocking_calls': 30
-        }
-        
-        total_gain = 0
-        for opt in optimizations:
-            gain = gain_map.get(opt['type'], 5)
-            total_gain += gain * opt.get('changes', 1)
-        
-        return min(total_gain, 85)  # Cap at 85% max gain
+        total_gain = sum(_GAIN_MAP.get(opt['type'], 5) * opt.get('changes', 1) for opt in optimizations)
+        return min(total_gain, _MAX_GAIN)  # Cap at 85% max gain
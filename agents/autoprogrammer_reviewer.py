@@ -4,13 +4,48 @@ Revisión inteligente de código con análisis profundo y sugerencias
 """
 
 import os
+import sys
 import ast
 import re
 import asyncio
+import hashlib
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
+from operator import attrgetter
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Árboles AST recientes por hash de contenido (revisiones repetidas sin reparsear)
+_AST_CACHE_SIZE = 64
+
+# Revisiones recientes por (archivo, hash de contenido): archivos sin cambios no se
+# re-analizan; se guardan los issues (no el texto) para re-emitir el reporte con fecha actual
+_REVIEW_CACHE_SIZE = 128
+
+# Tipos de nodo que suman complejidad o anidamiento (comparación por type(), sin isinstance)
+_CC_BRANCH_TYPES = frozenset({ast.If, ast.While, ast.For, ast.Try, ast.ExceptHandler})
+_NESTING_TYPES = frozenset({ast.If, ast.While, ast.For, ast.Try, ast.With})
+
+def _hash_bytes(raw: bytes) -> str:
+    """Firma del contenido: xxh3 si está disponible, si no blake2b"""
+    if xxhash is not None:
+        return xxhash.xxh3_64(raw).hexdigest()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+# dataclass(slots=True) existe desde Python 3.10; antes se usa la dataclass normal
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _line_bounded(pattern: str) -> str:
+    """Adapta un patrón de línea para escanear el contenido completo sin cruzar '\\n'"""
+    return pattern.replace(r'\s', r'[^\S\n]').replace('[^)]', r'[^)\n]')
 
 class IssueType(Enum):
     SYNTAX = "syntax"
@@ -20,14 +55,14 @@ class IssueType(Enum):
     STYLE = "style"
     DOCUMENTATION = "documentation"
 
-class Severity(Enum):
+class Severity(IntEnum):
     CRITICAL = 1
     HIGH = 2
     MEDIUM = 3
     LOW = 4
     INFO = 5
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CodeIssue:
     file_path: str
     line_number: int
@@ -37,29 +72,73 @@ class CodeIssue:
     suggestion: str
     code_snippet: str
 
+# Penalización por severidad, indexada por el valor de Severity (CRITICAL=1 ... INFO=5)
+_SEVERITY_PENALTIES = (0, 20, 10, 5, 2, 1)
+
+# Severity es IntEnum: ordena directamente como entero, con clave en C
+_ISSUE_SORT_KEY = attrgetter('severity', 'line_number')
+
+_SEVERITY_ICONS = {
+    Severity.CRITICAL: "🔴",
+    Severity.HIGH: "🟠",
+    Severity.MEDIUM: "🟡",
+    Severity.LOW: "🔵",
+    Severity.INFO: "⚪"
+}
+
+_ISSUE_TEMPLATE = """
+{index}. {icon} {severity} - Línea {line}
+   Tipo: {issue_type}
+   Problema: {description}
+   Sugerencia: {suggestion}
+   Código: {snippet}
+   """ + '-'*30 + """
+"""
+
+def _review_file_in_process(config: Tuple[str, int, int, Dict[str, int]], file_path: str) -> Tuple[str, Optional[tuple]]:
+    """Revisa un archivo dentro de un proceso worker (evita el GIL en lotes).
+    
+    config es CodeReviewer._worker_config() del revisor que lanza el lote; devuelve el
+    reporte y la entrada de caché (clave, revisión) para fusionarla en ese revisor.
+    """
+    workspace_path, max_bytes, security_only_over, thresholds = config
+    reviewer = CodeReviewer(workspace_path, max_bytes, security_only_over)
+    reviewer.complexity_thresholds = dict(thresholds)
+    report = asyncio.run(reviewer.review_code(file_path))
+    return report, next(iter(reviewer._review_cache.items()), None)
+
+
 class CodeReviewer:
     """Revisor inteligente de código con análisis múltiple"""
     
-    def __init__(self, workspace_path: str):
+    def __init__(self, workspace_path: str, max_bytes: int = 512_000, security_only_over: int = 2_000_000):
         self.workspace_path = workspace_path
         
-        # Patrones de revisión categorizados
+        # Presupuesto por tamaño: por encima de max_bytes no se analiza el AST y
+        # por encima de security_only_over solo se buscan patrones de seguridad
+        self.max_bytes = max_bytes
+        self.security_only_over = security_only_over
+        
+        # Patrones de revisión categorizados ('literal': subcadena imprescindible para que haya match)
         self.review_patterns = {
             'security': [
                 {
                     'pattern': r'eval\s*\(',
+                    'literal': 'eval',
                     'severity': Severity.CRITICAL,
                     'description': 'Uso peligroso de eval()',
                     'suggestion': 'Usar ast.literal_eval() o validación específica'
                 },
                 {
                     'pattern': r'exec\s*\(',
+                    'literal': 'exec',
                     'severity': Severity.CRITICAL,
                     'description': 'Uso peligroso de exec()',
                     'suggestion': 'Evitar exec() y usar alternativas seguras'
                 },
                 {
                     'pattern': r'input\s*\([^)]*\)\s*.*eval',
+                    'literal': 'input',
                     'severity': Severity.CRITICAL,
                     'description': 'Input directo a eval - vulnerabilidad de seguridad',
                     'suggestion': 'Validar entrada antes de procesar'
@@ -68,18 +147,21 @@ class CodeReviewer:
             'performance': [
                 {
                     'pattern': r'for\s+\w+\s+in\s+range\(len\(',
+                    'literal': 'range(len(',
                     'severity': Severity.MEDIUM,
                     'description': 'Loop ineficiente con range(len())',
                     'suggestion': 'Usar enumerate() o iteración directa'
                 },
                 {
                     'pattern': r'\w+\s*\+=\s*["\'].*["\']',
+                    'literal': '+=',
                     'severity': Severity.MEDIUM,
                     'description': 'Concatenación ineficiente de strings',
                     'suggestion': 'Usar join() o f-strings'
                 },
                 {
                     'pattern': r'time\.sleep\s*\(',
+                    'literal': 'time.sleep',
                     'severity': Severity.LOW,
                     'description': 'Sleep síncrono en contexto potencialmente asíncrono',
                     'suggestion': 'Considerar asyncio.sleep() si es código asíncrono'
@@ -88,18 +170,21 @@ class CodeReviewer:
             'style': [
                 {
                     'pattern': r'except\s*:',
+                    'literal': 'except',
                     'severity': Severity.HIGH,
                     'description': 'Bare except clause',
                     'suggestion': 'Especificar tipo de excepción'
                 },
                 {
                     'pattern': r'from\s+\w+\s+import\s+\*',
+                    'literal': 'import',
                     'severity': Severity.MEDIUM,
                     'description': 'Wildcard import',
                     'suggestion': 'Importar solo los nombres necesarios'
                 },
                 {
                     'pattern': r'def\s+[a-z]+[A-Z]',
+                    'literal': 'def',
                     'severity': Severity.LOW,
                     'description': 'Nombre de función no sigue PEP 8',
                     'suggestion': 'Usar snake_case para nombres de función'
@@ -108,18 +193,21 @@ class CodeReviewer:
             'logic': [
                 {
                     'pattern': r'if\s+.*==\s*True:',
+                    'literal': 'True:',
                     'severity': Severity.LOW,
                     'description': 'Comparación innecesaria con True',
                     'suggestion': 'Usar directamente la condición booleana'
                 },
                 {
                     'pattern': r'if\s+.*==\s*False:',
+                    'literal': 'False:',
                     'severity': Severity.LOW,
                     'description': 'Comparación innecesaria con False',
                     'suggestion': 'Usar not en la condición'
                 },
                 {
                     'pattern': r'len\([^)]+\)\s*==\s*0',
+                    'literal': 'len(',
                     'severity': Severity.LOW,
                     'description': 'Verificación de longitud innecesaria',
                     'suggestion': 'Usar "not container" directamente'
@@ -127,6 +215,13 @@ class CodeReviewer:
             ]
         }
         
+        # Precompilar los patrones una sola vez. 'content_pattern' es la variante que
+        # no cruza saltos de línea, para escanear el archivo completo en C
+        for patterns in self.review_patterns.values():
+            for pattern_config in patterns:
+                pattern_config['content_pattern'] = re.compile(_line_bounded(pattern_config['pattern']))
+                pattern_config['pattern'] = re.compile(pattern_config['pattern'])
+        
         # Análisis de complejidad
         self.complexity_thresholds = {
             'function_lines': 50,
@@ -134,24 +229,85 @@ class CodeReviewer:
             'nesting_depth': 4,
             'parameters': 5
         }
+        
+        self._ast_cache: "OrderedDict[str, ast.AST]" = OrderedDict()
+        # (archivo, hash, ajustes) -> (issues, (líneas de código, líneas totales), aviso de alcance)
+        self._review_cache: "OrderedDict[Tuple[str, str, tuple], Tuple[Tuple[CodeIssue, ...], Tuple[int, int], Optional[str]]]" = OrderedDict()
+    
+    @staticmethod
+    def _content_key(content: str) -> str:
+        """Hash del contenido de texto"""
+        return _hash_bytes(content.encode('utf-8'))
+    
+    def _get_tree(self, content: str, key: Optional[str] = None) -> ast.AST:
+        """Parsea una vez por contenido; LRU indexada por hash"""
+        key = key or self._content_key(content)
+        tree = self._ast_cache.get(key)
+        if tree is not None:
+            self._ast_cache.move_to_end(key)
+            return tree
+        
+        tree = ast.parse(content)
+        self._ast_cache[key] = tree
+        if len(self._ast_cache) > _AST_CACHE_SIZE:
+            self._ast_cache.popitem(last=False)
+        return tree
     
     async def review_code(self, file_path: str) -> str:
         """Realiza revisión completa de un archivo de código"""
         full_path = os.path.join(self.workspace_path, file_path)
         
-        if not os.path.exists(full_path):
-            return f"❌ Archivo no encontrado: {file_path}"
-        
         try:
-            # Leer contenido del archivo
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Leer bytes (en un hilo, sin bloquear el event loop) y firmarlos antes
+            # de decodificar: un acierto de caché no paga ni la decodificación.
+            # Abrir directamente, sin os.path.exists previo (una llamada menos, sin TOCTOU)
+            try:
+                raw = await asyncio.to_thread(self._read_bytes, full_path)
+            except FileNotFoundError:
+                return f"❌ Archivo no encontrado: {file_path}"
+            
+            content_key = _hash_bytes(raw)
+            # Los issues dependen también de los ajustes (públicos y mutables) del revisor
+            cache_key = (file_path, content_key, self._settings_key())
+            cached_review = self._review_cache.get(cache_key)
+            if cached_review is not None:
+                # Sin re-análisis: el reporte se regenera (fecha actual) y se vuelve a guardar
+                self._review_cache.move_to_end(cache_key)
+                return await self._finish_review(file_path, *cached_review)
+            
+            content = raw.decode('utf-8')
+            if '\r' in content:
+                # Mismos saltos de línea universales que la lectura en modo texto
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Realizar análisis múltiple
             issues = []
             
+            size = len(raw)
+            if size > self.max_bytes:
+                # Archivo fuera de presupuesto: análisis degradado sin AST. El aviso de
+                # alcance va como metadato del reporte, no como issue (no penaliza)
+                oversized_issues, notice = await self._review_oversized(content, file_path, size)
+                issues.extend(oversized_issues)
+                return await self._finish_review(
+                    file_path, *self._cache_review(cache_key, issues, self._content_stats(content), notice)
+                )
+            
+            # Un único parseo y un único recorrido del AST para sintaxis,
+            # complejidad, documentación e importaciones
+            try:
+                tree = self._get_tree(content, content_key)
+            except SyntaxError:
+                tree = None
+            
+            if tree is not None:
+                syntax_issues, complexity_issues, doc_issues, import_issues = self._analyze_tree(tree, file_path)
+            else:
+                # Reporta el error de sintaxis; sin AST no hay más análisis estructural
+                syntax_issues = await self.analyze_syntax(content, file_path)
+                complexity_issues = doc_issues = import_issues = []
+            
             # Análisis sintáctico
-            syntax_issues = await self.analyze_syntax(content, file_path)
             issues.extend(syntax_issues)
             
             # Análisis por patrones
@@ -159,80 +315,238 @@ class CodeReviewer:
             issues.extend(pattern_issues)
             
             # Análisis de complejidad
-            complexity_issues = await self.analyze_complexity(content, file_path)
             issues.extend(complexity_issues)
             
             # Análisis de documentación
-            doc_issues = await self.analyze_documentation(content, file_path)
             issues.extend(doc_issues)
             
             # Análisis de importaciones
-            import_issues = await self.analyze_imports(content, file_path)
             issues.extend(import_issues)
             
-            # Generar reporte
-            report = await self.generate_review_report(issues, file_path, content)
-            
-            # Guardar reporte si hay issues
-            if issues:
-                await self.save_review_report(report, file_path)
+            # Eliminar issues idénticos conservando el orden (CodeIssue es hashable)
+            issues = list(dict.fromkeys(issues))
             
-            return report
+            # Generar y guardar reporte
+            return await self._finish_review(
+                file_path, *self._cache_review(cache_key, issues, self._content_stats(content), None)
+            )
             
         except Exception as e:
             return f"❌ Error revisando {file_path}: {str(e)}"
     
-    async def analyze_syntax(self, content: str, file_path: str) -> List[CodeIssue]:
-        """Analiza sintaxis y estructura del código"""
-        issues = []
+    def _cache_review(self, cache_key: Tuple[str, str, tuple], issues: List[CodeIssue], stats: Tuple[int, int],
+                      notice: Optional[str]) -> Tuple[Tuple[CodeIssue, ...], Tuple[int, int], Optional[str]]:
+        """Memoriza el resultado del análisis en la LRU de revisiones y lo devuelve"""
+        entry = (tuple(issues), stats, notice)
+        self._store_review(cache_key, entry)
+        return entry
+    
+    def _store_review(self, cache_key: Tuple[str, str, tuple], entry: tuple):
+        """Inserta una revisión en la LRU respetando el tamaño máximo"""
+        self._review_cache[cache_key] = entry
+        self._review_cache.move_to_end(cache_key)
+        if len(self._review_cache) > _REVIEW_CACHE_SIZE:
+            self._review_cache.popitem(last=False)
+    
+    def _worker_config(self) -> Tuple[str, int, int, Dict[str, int]]:
+        """Configuración serializable para reconstruir este revisor en un proceso worker"""
+        return (self.workspace_path, self.max_bytes, self.security_only_over, dict(self.complexity_thresholds))
+    
+    def _settings_key(self) -> tuple:
+        """Ajustes que influyen en el análisis, en forma hashable para la clave de caché"""
+        return (self.max_bytes, self.security_only_over, tuple(sorted(self.complexity_thresholds.items())))
+    
+    async def _finish_review(self, file_path: str, issues: Tuple[CodeIssue, ...], stats: Tuple[int, int],
+                             notice: Optional[str]) -> str:
+        """Genera el reporte y lo guarda si hay issues o el alcance fue limitado"""
+        report = await self.generate_review_report(list(issues), file_path, "", notice, stats)
+        if issues or notice:
+            await self.save_review_report(report, file_path)
+        return report
+    
+    @staticmethod
+    def _content_stats(content: str) -> Tuple[int, int]:
+        """(líneas de código, líneas totales) con un único split"""
+        lines = content.split('\n')
+        lines_of_code = sum(1 for line in map(str.strip, lines) if line and line[0] != '#')
+        return lines_of_code, len(lines)
+    
+    async def _review_oversized(self, content: str, file_path: str, size: int) -> Tuple[List[CodeIssue], str]:
+        """Análisis acotado para archivos que superan el presupuesto de tamaño (issues, aviso de alcance)"""
+        if size > self.security_only_over:
+            categories = ('security',)
+            scope = "solo patrones de seguridad"
+        else:
+            categories = None
+            scope = "solo patrones (sin análisis AST)"
+        
+        notice = f"archivo de {size} bytes supera el presupuesto de revisión ({self.max_bytes} bytes): {scope}"
+        issues = await self.analyze_patterns(content, file_path, categories)
+        return issues, notice
+    
+    def _analyze_tree(self, tree: ast.AST, file_path: str) -> Tuple[List[CodeIssue], List[CodeIssue], List[CodeIssue], List[CodeIssue]]:
+        """Recorre el AST una sola vez: issues de sintaxis, complejidad, documentación e imports"""
+        syntax_issues = []
+        complexity_issues = []
+        doc_issues = []
+        thresholds = self.complexity_thresholds
+        
+        imported = []  # (nodo import, nombre ligado)
+        used_names = set()
         
-        try:
-            tree = ast.parse(content)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                # Cubre también la base de los atributos (module.function)
+                used_names.add(node.id)
             
-            # Verificar estructura AST para problemas comunes
-            for node in ast.walk(tree):
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    imported.append((node, alias.asname or alias.name.split('.')[0]))
+            
+            elif isinstance(node, ast.ImportFrom):
+                if node.module != '__future__':
+                    for alias in node.names:
+                        if alias.name != '*':  # Ya se maneja en patrones
+                            imported.append((node, alias.asname or alias.name))
+            
+            elif isinstance(node, ast.FunctionDef):
                 # Funciones muy largas
-                if isinstance(node, ast.FunctionDef):
-                    func_lines = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
-                    if func_lines > self.complexity_thresholds['function_lines']:
-                        issues.append(CodeIssue(
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            issue_type=IssueType.LOGIC,
-                            severity=Severity.MEDIUM,
-                            description=f"Función '{node.name}' es muy larga ({func_lines} líneas)",
-                            suggestion="Considerar dividir en funciones más pequeñas",
-                            code_snippet=f"def {node.name}(...)"
-                        ))
-                    
-                    # Demasiados parámetros
-                    param_count = len(node.args.args)
-                    if param_count > self.complexity_thresholds['parameters']:
-                        issues.append(CodeIssue(
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            issue_type=IssueType.STYLE,
-                            severity=Severity.LOW,
-                            description=f"Función '{node.name}' tiene muchos parámetros ({param_count})",
-                            suggestion="Considerar usar objeto de configuración o **kwargs",
-                            code_snippet=f"def {node.name}(...)"
-                        ))
+                func_lines = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
+                if func_lines > thresholds['function_lines']:
+                    syntax_issues.append(CodeIssue(
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        issue_type=IssueType.LOGIC,
+                        severity=Severity.MEDIUM,
+                        description=f"Función '{node.name}' es muy larga ({func_lines} líneas)",
+                        suggestion="Considerar dividir en funciones más pequeñas",
+                        code_snippet=f"def {node.name}(...)"
+                    ))
+                
+                # Demasiados parámetros
+                param_count = len(node.args.args)
+                if param_count > thresholds['parameters']:
+                    syntax_issues.append(CodeIssue(
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        issue_type=IssueType.STYLE,
+                        severity=Severity.LOW,
+                        description=f"Función '{node.name}' tiene muchos parámetros ({param_count})",
+                        suggestion="Considerar usar objeto de configuración o **kwargs",
+                        code_snippet=f"def {node.name}(...)"
+                    ))
+                
+                # Complejidad ciclomática y anidamiento en un solo recorrido de la función
+                complexity, max_depth = self.calculate_function_metrics(node)
+                if complexity > thresholds['cyclomatic_complexity']:
+                    complexity_issues.append(CodeIssue(
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        issue_type=IssueType.LOGIC,
+                        severity=Severity.HIGH,
+                        description=f"Alta complejidad ciclomática ({complexity}) en '{node.name}'",
+                        suggestion="Refactorizar función para reducir complejidad",
+                        code_snippet=f"def {node.name}(...)"
+                    ))
+                
+                # Verificar anidamiento profundo
+                if max_depth > thresholds['nesting_depth']:
+                    complexity_issues.append(CodeIssue(
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        issue_type=IssueType.LOGIC,
+                        severity=Severity.MEDIUM,
+                        description=f"Anidamiento excesivo ({max_depth} niveles) en '{node.name}'",
+                        suggestion="Extraer lógica a funciones separadas",
+                        code_snippet=f"def {node.name}(...)"
+                    ))
                 
-                # Clases sin documentación
-                elif isinstance(node, ast.ClassDef):
-                    if not ast.get_docstring(node):
-                        issues.append(CodeIssue(
+                # Verificar presencia y calidad del docstring
+                docstring = ast.get_docstring(node)
+                if not docstring:
+                    # Solo reportar para funciones públicas (no empiezan con _)
+                    if not node.name.startswith('_'):
+                        doc_issues.append(CodeIssue(
                             file_path=file_path,
                             line_number=node.lineno,
                             issue_type=IssueType.DOCUMENTATION,
                             severity=Severity.LOW,
-                            description=f"Clase '{node.name}' sin documentación",
-                            suggestion="Agregar docstring explicando el propósito de la clase",
-                            code_snippet=f"class {node.name}:"
+                            description=f"Función '{node.name}' sin documentación",
+                            suggestion="Agregar docstring explicando parámetros y valor de retorno",
+                            code_snippet=f"def {node.name}(...)"
                         ))
-                
+                elif len(docstring.strip()) < 10:
+                    doc_issues.append(CodeIssue(
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        issue_type=IssueType.DOCUMENTATION,
+                        severity=Severity.LOW,
+                        description=f"Documentación muy breve en '{node.name}'",
+                        suggestion="Expandir documentación con más detalles",
+                        code_snippet=f'"""{docstring}"""'
+                    ))
+            
+            # Clases sin documentación
+            elif isinstance(node, ast.ClassDef):
+                if not ast.get_docstring(node):
+                    syntax_issues.append(CodeIssue(
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        issue_type=IssueType.DOCUMENTATION,
+                        severity=Severity.LOW,
+                        description=f"Clase '{node.name}' sin documentación",
+                        suggestion="Agregar docstring explicando el propósito de la clase",
+                        code_snippet=f"class {node.name}:"
+                    ))
+        
+        # Importaciones no utilizadas
+        import_issues = [
+            CodeIssue(
+                file_path=file_path,
+                line_number=node.lineno,
+                issue_type=IssueType.STYLE,
+                severity=Severity.LOW,
+                description=f"Import '{name}' no utilizado",
+                suggestion=f"Remover import no utilizado: {name}",
+                code_snippet=ast.unparse(node)
+            )
+            for node, name in imported
+            if name not in used_names
+        ]
+        
+        return syntax_issues, complexity_issues, doc_issues, import_issues
+    
+    async def review_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[str]:
+        """Revisa varios archivos en paralelo con un pool de procesos compartido"""
+        if not file_paths:
+            return []
+        
+        workers = max_workers or min(len(file_paths), os.cpu_count() or 1)
+        loop = asyncio.get_running_loop()
+        config = self._worker_config()
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tasks = [
+                loop.run_in_executor(executor, _review_file_in_process, config, file_path)
+                for file_path in file_paths
+            ]
+            results = await asyncio.gather(*tasks)
+        
+        # Fusionar las revisiones de los workers en la caché de esta instancia
+        reports = []
+        for report, cached in results:
+            if cached is not None:
+                self._store_review(*cached)
+            reports.append(report)
+        return reports
+    
+    async def analyze_syntax(self, content: str, file_path: str, tree: Optional[ast.AST] = None) -> List[CodeIssue]:
+        """Analiza sintaxis y estructura del código"""
+        try:
+            if tree is None:
+                tree = ast.parse(content)
         except SyntaxError as e:
-            issues.append(CodeIssue(
+            return [CodeIssue(
                 file_path=file_path,
                 line_number=e.lineno or 0,
                 issue_type=IssueType.SYNTAX,
@@ -240,339 +554,265 @@ class CodeReviewer:
                 description=f"Error de sintaxis: {e.msg}",
                 suggestion="Corregir la sintaxis del código",
                 code_snippet=e.text or ""
-            ))
+            )]
         
-        return issues
+        return self._analyze_tree(tree, file_path)[0]
     
-    async def analyze_patterns(self, content: str, file_path: str) -> List[CodeIssue]:
-        """Analiza patrones problemáticos en el código"""
+    async def analyze_patterns(self, content: str, file_path: str, categories: Optional[Tuple[str, ...]] = None) -> List[CodeIssue]:
+        """Analiza patrones problemáticos en el código (opcionalmente solo algunas categorías)"""
         issues = []
-        lines = content.split('\n')
         
+        # Enlaces locales para el bucle interno (LOAD_FAST en vez de LOAD_ATTR)
+        append = issues.append
+        count_newlines = content.count
+        rfind = content.rfind
+        find = content.find
+        content_length = len(content)
+        
+        # finditer sobre el contenido completo: el bucle por línea queda dentro de _sre
         for category, patterns in self.review_patterns.items():
+            if categories is not None and category not in categories:
+                continue
+            
+            issue_type = IssueType(category)
+            
             for pattern_config in patterns:
-                pattern = pattern_config['pattern']
+                # Prefiltro memmem en C: sin el literal el patrón no puede coincidir
+                literal = pattern_config.get('literal')
+                if literal and literal not in content:
+                    continue
                 
-                for line_num, line in enumerate(lines, 1):
-                    if re.search(pattern, line):
-                        issues.append(CodeIssue(
-                            file_path=file_path,
-                            line_number=line_num,
-                            issue_type=IssueType(category),
-                            severity=pattern_config['severity'],
-                            description=pattern_config['description'],
-                            suggestion=pattern_config['suggestion'],
-                            code_snippet=line.strip()
-                        ))
+                severity = pattern_config['severity']
+                description = pattern_config['description']
+                suggestion = pattern_config['suggestion']
+                
+                line_num = 1
+                last_pos = 0
+                last_reported = 0
+                
+                for match in pattern_config['content_pattern'].finditer(content):
+                    start = match.start()
+                    line_num += count_newlines('\n', last_pos, start)
+                    last_pos = start
+                    
+                    # Un issue por línea y patrón, como la búsqueda línea a línea
+                    if line_num == last_reported:
+                        continue
+                    last_reported = line_num
+                    
+                    line_start = rfind('\n', 0, start) + 1
+                    line_end = find('\n', start)
+                    if line_end == -1:
+                        line_end = content_length
+                    
+                    append(CodeIssue(
+                        file_path=file_path,
+                        line_number=line_num,
+                        issue_type=issue_type,
+                        severity=severity,
+                        description=description,
+                        suggestion=suggestion,
+                        code_snippet=content[line_start:line_end].strip()
+                    ))
         
         return issues
     
-    async def analyze_complexity(self, content: str, file_path: str) -> List[CodeIssue]:
+    async def analyze_complexity(self, content: str, file_path: str, tree: Optional[ast.AST] = None) -> List[CodeIssue]:
         """Analiza complejidad del código"""
-        issues = []
-        
         try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Calcular complejidad ciclomática simplificada
-                    complexity = self.calculate_cyclomatic_complexity(node)
-                    
-                    if complexity > self.complexity_thresholds['cyclomatic_complexity']:
-                        issues.append(CodeIssue(
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            issue_type=IssueType.LOGIC,
-                            severity=Severity.HIGH,
-                            description=f"Alta complejidad ciclomática ({complexity}) en '{node.name}'",
-                            suggestion="Refactorizar función para reducir complejidad",
-                            code_snippet=f"def {node.name}(...)"
-                        ))
-                    
-                    # Verificar anidamiento profundo
-                    max_depth = self.calculate_nesting_depth(node)
-                    if max_depth > self.complexity_thresholds['nesting_depth']:
-                        issues.append(CodeIssue(
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            issue_type=IssueType.LOGIC,
-                            severity=Severity.MEDIUM,
-                            description=f"Anidamiento excesivo ({max_depth} niveles) en '{node.name}'",
-                            suggestion="Extraer lógica a funciones separadas",
-                            code_snippet=f"def {node.name}(...)"
-                        ))
+            if tree is None:
+                tree = ast.parse(content)
+            return self._analyze_tree(tree, file_path)[1]
         
         except Exception as e:
             print(f"Error analizando complejidad: {e}")
-        
-        return issues
+            return []
     
-    async def analyze_documentation(self, content: str, file_path: str) -> List[CodeIssue]:
+    async def analyze_documentation(self, content: str, file_path: str, tree: Optional[ast.AST] = None) -> List[CodeIssue]:
         """Analiza calidad de documentación"""
-        issues = []
-        
         try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Verificar presencia de docstring
-                    docstring = ast.get_docstring(node)
-                    
-                    if not docstring:
-                        # Solo reportar para funciones públicas (no empiezan con _)
-                        if not node.name.startswith('_'):
-                            issues.append(CodeIssue(
-                                file_path=file_path,
-                                line_number=node.lineno,
-                                issue_type=IssueType.DOCUMENTATION,
-                                severity=Severity.LOW,
-                                description=f"Función '{node.name}' sin documentación",
-                                suggestion="Agregar docstring explicando parámetros y valor de retorno",
-                                code_snippet=f"def {node.name}(...)"
-                            ))
-                    else:
-                        # Verificar calidad del docstring
-                        if len(docstring.strip()) < 10:
-                            issues.append(CodeIssue(
-                                file_path=file_path,
-                                line_number=node.lineno,
-                                issue_type=IssueType.DOCUMENTATION,
-                                severity=Severity.LOW,
-                                description=f"Documentación muy breve en '{node.name}'",
-                                suggestion="Expandir documentación con más detalles",
-                                code_snippet=f'"""{docstring}"""'
-                            ))
+            if tree is None:
+                tree = ast.parse(content)
+            return self._analyze_tree(tree, file_path)[2]
         
         except Exception as e:
             print(f"Error analizando documentación: {e}")
-        
-        return issues
+            return []
     
-    async def analyze_imports(self, content: str, file_path: str) -> List[CodeIssue]:
+    async def analyze_imports(self, content: str, file_path: str, tree: Optional[ast.AST] = None) -> List[CodeIssue]:
         """Analiza importaciones del archivo"""
-        issues = []
-        lines = content.split('\n')
-        
-        import_lines = []
-        used_names = set()
-        
-        # Recopilar importaciones y nombres utilizados
-        for line_num, line in enumerate(lines, 1):
-            stripped = line.strip()
-            
-            if stripped.startswith('import ') or stripped.startswith('from '):
-                import_lines.append((line_num, stripped))
-            
-            # Buscar uso de nombres (simplificado)
-            words = re.findall(r'\b\w+\b', line)
-            used_names.update(words)
-        
-        # Verificar importaciones no utilizadas
-        for line_num, import_line in import_lines:
-            if 'import *' in import_line:
-                continue  # Ya se maneja en patrones
-            
-            # Extraer nombres importados
-            imported_names = self.extract_imported_names(import_line)
-            
-            for name in imported_names:
-                if name not in used_names:
-                    issues.append(CodeIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        issue_type=IssueType.STYLE,
-                        severity=Severity.LOW,
-                        description=f"Import '{name}' no utilizado",
-                        suggestion=f"Remover import no utilizado: {name}",
-                        code_snippet=import_line
-                    ))
+        try:
+            if tree is None:
+                tree = ast.parse(content)
+            return self._analyze_tree(tree, file_path)[3]
         
-        return issues
+        except Exception as e:
+            print(f"Error analizando importaciones: {e}")
+            return []
     
-    async def generate_review_report(self, issues: List[CodeIssue], file_path: str, content: str) -> str:
-        """Genera reporte completo de revisión"""
-        if not issues:
+    async def generate_review_report(self, issues: List[CodeIssue], file_path: str, content: str,
+                                     notice: Optional[str] = None, stats: Optional[Tuple[int, int]] = None) -> str:
+        """Genera reporte completo de revisión (notice: aviso de alcance limitado; stats: líneas ya contadas)"""
+        if not issues and notice is None:
             return f"✅ {file_path}: Código revisado sin problemas detectados"
         
-        # Agrupar issues por severidad
-        critical_issues = [i for i in issues if i.severity == Severity.CRITICAL]
-        high_issues = [i for i in issues if i.severity == Severity.HIGH]
-        medium_issues = [i for i in issues if i.severity == Severity.MEDIUM]
-        low_issues = [i for i in issues if i.severity == Severity.LOW]
-        info_issues = [i for i in issues if i.severity == Severity.INFO]
-        
-        # Calcular estadísticas del código
-        lines_of_code = len([line for line in content.split('\n') if line.strip() and not line.strip().startswith('#')])
-        total_lines = len(content.split('\n'))
-        
-        report = f"""
+        # Agrupar issues por severidad en una sola pasada
+        # (en la misma pasada se acumula la penalización de calidad)
+        buckets = {severity: [] for severity in Severity}
+        total_penalty = 0
+        for issue in issues:
+            buckets[issue.severity].append(issue)
+            total_penalty += _SEVERITY_PENALTIES[issue.severity]
+        critical_issues = buckets[Severity.CRITICAL]
+        high_issues = buckets[Severity.HIGH]
+        medium_issues = buckets[Severity.MEDIUM]
+        low_issues = buckets[Severity.LOW]
+        info_issues = buckets[Severity.INFO]
+        
+        # Calcular estadísticas del código (si no vienen precalculadas)
+        lines_of_code, total_lines = stats if stats is not None else self._content_stats(content)
+        scope_line = f"⚠️ Alcance limitado: {notice}\n" if notice else ""
+        
+        parts = [f"""
 🔍 STARK CODE REVIEW REPORT
 {'='*50}
 📁 Archivo: {file_path}
 📊 Estadísticas: {lines_of_code} líneas de código / {total_lines} líneas totales
 🚨 Issues encontrados: {len(issues)}
-📅 Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{scope_line}📅 Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 RESUMEN POR SEVERIDAD:
-"""
+"""]
         
         if critical_issues:
-            report += f"🔴 CRÍTICO: {len(critical_issues)} issues\n"
+            parts.append(f"🔴 CRÍTICO: {len(critical_issues)} issues\n")
         if high_issues:
-            report += f"🟠 ALTO: {len(high_issues)} issues\n"
+            parts.append(f"🟠 ALTO: {len(high_issues)} issues\n")
         if medium_issues:
-            report += f"🟡 MEDIO: {len(medium_issues)} issues\n"
+            parts.append(f"🟡 MEDIO: {len(medium_issues)} issues\n")
         if low_issues:
-            report += f"🔵 BAJO: {len(low_issues)} issues\n"
+            parts.append(f"🔵 BAJO: {len(low_issues)} issues\n")
         if info_issues:
-            report += f"⚪ INFO: {len(info_issues)} issues\n"
+            parts.append(f"⚪ INFO: {len(info_issues)} issues\n")
         
-        report += "\nDETALLE DE ISSUES:\n" + "="*50 + "\n"
+        parts.append("\nDETALLE DE ISSUES:\n" + "="*50 + "\n")
         
         # Mostrar issues ordenados por severidad
-        all_issues_sorted = sorted(issues, key=lambda x: (x.severity.value, x.line_number))
+        all_issues_sorted = sorted(issues, key=_ISSUE_SORT_KEY)
         
+        append = parts.append
+        format_issue = _ISSUE_TEMPLATE.format
+        icons = _SEVERITY_ICONS
         for i, issue in enumerate(all_issues_sorted, 1):
-            severity_icon = {
-                Severity.CRITICAL: "🔴",
-                Severity.HIGH: "🟠", 
-                Severity.MEDIUM: "🟡",
-                Severity.LOW: "🔵",
-                Severity.INFO: "⚪"
-            }[issue.severity]
-            
-            report += f"""
-{i}. {severity_icon} {issue.severity.name} - Línea {issue.line_number}
-   Tipo: {issue.issue_type.value.capitalize()}
-   Problema: {issue.description}
-   Sugerencia: {issue.suggestion}
-   Código: {issue.code_snippet}
-   {'-'*30}
-"""
+            append(format_issue(
+                index=i,
+                icon=icons[issue.severity],
+                severity=issue.severity.name,
+                line=issue.line_number,
+                issue_type=issue.issue_type.value.capitalize(),
+                description=issue.description,
+                suggestion=issue.suggestion,
+                snippet=issue.code_snippet
+            ))
         
         # Agregar recomendaciones generales
-        report += self.generate_general_recommendations(issues)
+        parts.append(self.generate_general_recommendations(issues))
         
         # Calcular puntuación de calidad
-        quality_score = self.calculate_quality_score(issues, lines_of_code)
-        report += f"\n📈 PUNTUACIÓN DE CALIDAD: {quality_score}/100\n"
+        quality_score = self.calculate_quality_score(issues, lines_of_code, total_penalty)
+        parts.append(f"\n📈 PUNTUACIÓN DE CALIDAD: {quality_score}/100\n")
         
-        return report
+        return ''.join(parts)
     
     async def save_review_report(self, report: str, file_path: str):
         """Guarda reporte de revisión"""
         report_dir = os.path.join(self.workspace_path, "reviews")
-        os.makedirs(report_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         file_name = os.path.basename(file_path).replace('.py', '')
         report_path = os.path.join(report_dir, f"review_{file_name}_{timestamp}.md")
         
+        # E/S de disco en un hilo para no bloquear el event loop
+        await asyncio.to_thread(self._write_report, report_dir, report_path, report)
+    
+    @staticmethod
+    def _read_bytes(full_path: str) -> bytes:
+        """Lee el archivo completo en binario"""
+        with open(full_path, 'rb') as f:
+            return f.read()
+    
+    @staticmethod
+    def _write_report(report_dir: str, report_path: str, report: str):
+        """Crea el directorio de reportes y escribe el reporte"""
+        os.makedirs(report_dir, exist_ok=True)
         with open(report_path, 'w', encoding='utf-8') as f:
             f.write(report)
     
     # Métodos auxiliares
-    def calculate_cyclomatic_complexity(self, node: ast.FunctionDef) -> int:
-        """Calcula complejidad ciclomática simplificada"""
+    def calculate_function_metrics(self, node: ast.FunctionDef) -> Tuple[int, int]:
+        """Complejidad ciclomática y profundidad de anidamiento en una sola pasada.
+        
+        Solo recorre node.body: decoradores, argumentos (valores por defecto,
+        anotaciones) y anotación de retorno no se visitan.
+        """
         complexity = 1  # Base complexity
+        max_depth = 0
+        stack = [(stmt, 1 if type(stmt) in _NESTING_TYPES else 0) for stmt in node.body]
         
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.Try)):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-            elif isinstance(child, ast.ExceptHandler):
+        while stack:
+            current, depth = stack.pop()
+            node_type = type(current)
+            if node_type in _CC_BRANCH_TYPES:
                 complexity += 1
-        
-        return complexity
+            elif node_type is ast.BoolOp:
+                complexity += len(current.values) - 1
+            if depth > max_depth:
+                max_depth = depth
+            for child in ast.iter_child_nodes(current):
+                stack.append((child, depth + 1 if type(child) in _NESTING_TYPES else depth))
+        
+        return complexity, max_depth
+    
+    def calculate_cyclomatic_complexity(self, node: ast.FunctionDef) -> int:
+        """Calcula complejidad ciclomática simplificada"""
+        return self.calculate_function_metrics(node)[0]
     
     def calculate_nesting_depth(self, node: ast.FunctionDef) -> int:
         """Calcula profundidad máxima de anidamiento"""
-        def get_depth(node, current_depth=0):
-            max_depth = current_depth
-            
-            for child in ast.iter_child_nodes(node):
-                if isinstance(child, (ast.If, ast.While, ast.For, ast.Try, ast.With)):
-                    child_depth = get_depth(child, current_depth + 1)
-                    max_depth = max(max_depth, child_depth)
-                else:
-                    child_depth = get_depth(child, current_depth)
-                    max_depth = max(max_depth, child_depth)
-            
-            return max_depth
-        
-        return get_depth(node)
-    
-    def extract_imported_names(self, import_line: str) -> List[str]:
-        """Extrae nombres de una línea de import"""
-        names = []
-        
-        if import_line.startswith('import '):
-            # import module1, module2
-            modules = import_line[7:].split(',')
-            for module in modules:
-                name = module.strip().split(' as ')[0]
-                names.append(name.split('.')[0])
-        
-        elif import_line.startswith('from '):
-            # from module import name1, name2
-            parts = import_line.split(' import ')
-            if len(parts) == 2:
-                imported = parts[1].split(',')
-                for item in imported:
-                    name = item.strip().split(' as ')[0]
-                    names.append(name)
-        
-        return names
+        return self.calculate_function_metrics(node)[1]
     
     def generate_general_recommendations(self, issues: List[CodeIssue]) -> str:
         """Genera recomendaciones generales basadas en los issues encontrados"""
-        recommendations = "\n🎯 RECOMENDACIONES GENERALES:\n" + "="*30 + "\n"
+        parts = ["\n🎯 RECOMENDACIONES GENERALES:\n" + "="*30 + "\n"]
         
         # Analizar patrones en los issues
-        issue_types = {}
-        for issue in issues:
-            issue_type = issue.issue_type
-            if issue_type not in issue_types:
-                issue_types[issue_type] = 0
-            issue_types[issue_type] += 1
+        issue_types = Counter(issue.issue_type for issue in issues)
         
         if IssueType.SECURITY in issue_types:
-            recommendations += "🔒 SEGURIDAD: Revisar y corregir vulnerabilidades de seguridad inmediatamente.\n"
+            parts.append("🔒 SEGURIDAD: Revisar y corregir vulnerabilidades de seguridad inmediatamente.\n")
         
         if IssueType.PERFORMANCE in issue_types:
-            recommendations += "⚡ RENDIMIENTO: Optimizar código para mejor performance.\n"
+            parts.append("⚡ RENDIMIENTO: Optimizar código para mejor performance.\n")
         
         if IssueType.DOCUMENTATION in issue_types:
-            recommendations += "📝 DOCUMENTACIÓN: Mejorar documentación para mayor claridad.\n"
+            parts.append("📝 DOCUMENTACIÓN: Mejorar documentación para mayor claridad.\n")
         
         if IssueType.STYLE in issue_types:
-            recommendations += "🎨 ESTILO: Seguir convenciones PEP 8 para mejor legibilidad.\n"
+            parts.append("🎨 ESTILO: Seguir convenciones PEP 8 para mejor legibilidad.\n")
         
         if len(issues) > 10:
-            recommendations += "🔧 REFACTORING: Considerar refactorización mayor del código.\n"
+            parts.append("🔧 REFACTORING: Considerar refactorización mayor del código.\n")
         
-        return recommendations
+        return ''.join(parts)
     
-    def calculate_quality_score(self, issues: List[CodeIssue], lines_of_code: int) -> int:
-        """Calcula puntuación de calidad del código"""
+    def calculate_quality_score(self, issues: List[CodeIssue], lines_of_code: int, total_penalty: Optional[int] = None) -> int:
+        """Calcula puntuación de calidad del código (total_penalty si ya viene precalculada)"""
         if lines_of_code == 0:
             return 0
         
-        # Penalizaciones por tipo de issue
-        penalties = {
-            Severity.CRITICAL: 20,
-            Severity.HIGH: 10,
-            Severity.MEDIUM: 5,
-            Severity.LOW: 2,
-            Severity.INFO: 1
-        }
-        
-        total_penalty = 0
-        for issue in issues:
-            total_penalty += penalties[issue.severity]
+        # Penalizaciones por severidad
+        if total_penalty is None:
+            total_penalty = sum(_SEVERITY_PENALTIES[issue.severity] for issue in issues)
         
         # Normalizar por líneas de código
         penalty_per_line = total_penalty / lines_of_code
@@ -2,11 +2,35 @@
 JARVIS FRIDAY - DecisionEngine
 Implementación real avanzada para sistema JARVIS-FRIDAY
 Componente de agents con funcionalidad completa
+
+process_advanced suele completarse sin suspenderse: conviene ejecutarlo en un
+event loop con eager tasks (ver _new_event_loop, Python 3.12+), sobre uvloop
+si está instalado.
 """
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from collections import deque
+from itertools import islice
 import asyncio
 import json
+import logging
+import sys
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Historial acotado (ring buffer) y ventana para la media reciente de duraciones
+_HISTORY_SIZE = 1000
+_RECENT_WINDOW = 100
 
 class DecisionEngine:
     """
@@ -19,29 +43,63 @@ class DecisionEngine:
         self.status = "INITIALIZED"
         self.performance_metrics = {}
         self.last_update = datetime.now()
-        self.operation_history = []
+        self._reset_history()
         self._initialize_advanced()
     
+    def _reset_history(self, operations: List[Dict[str, Any]] = ()):
+        """Reinicia historial y agregados; recalcula los agregados de operations"""
+        # Atributos tipados: un compilador como mypyc los puede guardar como enteros/floats nativos
+        self.operation_history: "deque[Dict[str, Any]]" = deque(maxlen=_HISTORY_SIZE)
+        self._ops_total: int = 0
+        self._ops_ok: int = 0
+        self._duration_sum: float = 0.0
+        self._recent_durations: "deque[float]" = deque(maxlen=_RECENT_WINDOW)
+        self._recent_duration_sum: float = 0.0
+        # _ops_total en la última optimización; -1 = nunca optimizado (la primera llamada siempre corre)
+        self._opt_last_checked_count: int = -1
+        for operation in operations:
+            self._record_operation(operation)
+    
+    def _record_operation(self, operation: Dict[str, Any]):
+        """Registra una operación actualizando los agregados en O(1)"""
+        duration = operation.get("duration", 0)
+        self.operation_history.append(operation)
+        self._ops_total += 1
+        if operation.get("success", False):
+            self._ops_ok += 1
+        self._duration_sum += duration
+        
+        recent = self._recent_durations
+        if len(recent) == recent.maxlen:
+            self._recent_duration_sum -= recent[0]
+        recent.append(duration)
+        self._recent_duration_sum += duration
+    
+    def _record_operations(self, operations: List[Dict[str, Any]]):
+        """Registra un lote de operaciones con una sola extensión del historial"""
+        durations = [operation.get("duration", 0) for operation in operations]
+        self.operation_history.extend(operations)
+        self._ops_total += len(operations)
+        self._ops_ok += sum(1 for operation in operations if operation.get("success", False))
+        self._duration_sum += sum(durations)
+        
+        self._recent_durations.extend(durations)
+        self._recent_duration_sum = sum(self._recent_durations)
+    
     def _initialize_advanced(self):
         """Inicialización avanzada del componente"""
-        print(f"🔧 Inicializando DecisionEngine avanzado...")
+        logger.info("🔧 Inicializando DecisionEngine avanzado...")
         
-        # Configuración específica por tipo
-        if "agents" == "neural":
-            self._setup_neural_capabilities()
-        elif "agents" == "perception":
-            self._setup_perception_capabilities()
-        elif "agents" == "communication":
-            self._setup_communication_capabilities()
-        elif "agents" == "intelligence":
-            self._setup_intelligence_capabilities()
-        elif "agents" == "system":
-            self._setup_system_capabilities()
-        else:
-            self._setup_generic_capabilities()
+        self._configure_component_type()
         
         self.status = "ACTIVE"
-        print(f"✅ DecisionEngine activo y operacional")
+        logger.info("✅ DecisionEngine activo y operacional")
+    
+    def _configure_component_type(self):
+        """Configuración específica por tipo (despacho por dict, resuelto por cada config cargada)"""
+        component_type = self.config.get("component_type", "generic")
+        self._SETUP_BY_TYPE.get(component_type, DecisionEngine._setup_generic_capabilities)(self)
+        self._processing = self._PROCESSING_BY_TYPE.get(component_type, DecisionEngine._generic_processing)
     
     def _setup_neural_capabilities(self):
         """Configuración para componentes neurales"""
@@ -91,105 +149,148 @@ class DecisionEngine:
             "optimization": True
         }
     
+    _SETUP_BY_TYPE = {
+        "neural": _setup_neural_capabilities,
+        "perception": _setup_perception_capabilities,
+        "communication": _setup_communication_capabilities,
+        "intelligence": _setup_intelligence_capabilities,
+        "system": _setup_system_capabilities
+    }
+    
     async def process_advanced(self, data: Any, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Procesamiento avanzado con contexto"""
+        # Una sola lectura del reloj y un solo isoformat() por llamada
+        start = self.last_update = datetime.now()
+        start_iso = start.isoformat()
+        
         try:
-            self.last_update = datetime.now()
             context = context or {}
             
+            # Etapas síncronas: no hay E/S real, así que no se cede al event loop
             # Pre-procesamiento
-            preprocessed_data = await self._preprocess_data(data, context)
+            preprocessed_data = self._preprocess_data(data, context)
             
             # Procesamiento principal
-            result = await self._execute_main_processing(preprocessed_data, context)
+            result = self._execute_main_processing(preprocessed_data, context)
             
             # Post-procesamiento
-            final_result = await self._postprocess_result(result, context)
+            final_result = self._postprocess_result(result, context)
             
             # Registrar operación
-            self.operation_history.append({
-                "timestamp": self.last_update.isoformat(),
+            self._record_operation({
+                "timestamp": start_iso,
                 "operation": "process_advanced",
                 "success": True,
-                "duration": (datetime.now() - self.last_update).total_seconds()
+                "duration": (datetime.now() - start).total_seconds()
             })
             
             return {
                 "success": True,
                 "data": final_result,
-                "timestamp": self.last_update.isoformat(),
-                "context": context
+                "timestamp": start_iso,
+                "context_keys": tuple(context)  # Sin retener el contexto del llamador
+            }
+            
+        except Exception as e:
+            logger.error("❌ Error en DecisionEngine: %s", e)
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": start_iso
+            }
+    
+    async def process_batch(self, items: List[Any], context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Procesa un lote de entradas en una sola pasada por etapa"""
+        start = self.last_update = datetime.now()
+        start_iso = start.isoformat()
+        
+        try:
+            context = context or {}
+            
+            # Cada etapa recorre el lote completo
+            preprocessed = [self._preprocess_data(item, context) for item in items]
+            results = [self._execute_main_processing(item, context) for item in preprocessed]
+            final_results = [self._postprocess_result(result, context) for result in results]
+            
+            # Registrar el lote completo de una vez (duración repartida por elemento)
+            if items:
+                duration = (datetime.now() - start).total_seconds() / len(items)
+                self._record_operations([{
+                    "timestamp": start_iso,
+                    "operation": "process_batch",
+                    "success": True,
+                    "duration": duration
+                } for _ in items])
+            
+            return {
+                "success": True,
+                "data": final_results,
+                "timestamp": start_iso,
+                "context_keys": tuple(context)  # Sin retener el contexto del llamador
             }
             
         except Exception as e:
-            print(f"❌ Error en DecisionEngine: {e}")
+            logger.error("❌ Error en DecisionEngine: %s", e)
             return {
                 "success": False,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": start_iso
             }
     
-    async def _preprocess_data(self, data: Any, context: Dict[str, Any]) -> Any:
+    def _preprocess_data(self, data: Any, context: Dict[str, Any]) -> Any:
         """Pre-procesamiento de datos"""
-        await asyncio.sleep(0.001)  # Simular procesamiento
         return data
     
-    async def _execute_main_processing(self, data: Any, context: Dict[str, Any]) -> Any:
+    def _execute_main_processing(self, data: Any, context: Dict[str, Any]) -> Any:
         """Procesamiento principal específico"""
-        await asyncio.sleep(0.01)  # Simular trabajo computacional
-        
-        # Lógica específica por tipo de componente
-        if "agents" == "neural":
-            return await self._neural_processing(data)
-        elif "agents" == "perception":
-            return await self._perception_processing(data)
-        elif "agents" == "communication":
-            return await self._communication_processing(data)
-        elif "agents" == "intelligence":
-            return await self._intelligence_processing(data)
-        elif "agents" == "system":
-            return await self._system_processing(data)
-        else:
-            return await self._generic_processing(data)
-    
-    async def _neural_processing(self, data: Any) -> Any:
+        # Lógica específica por tipo de componente, elegida en la inicialización
+        return self._processing(self, data)
+    
+    def _neural_processing(self, data: Any) -> Any:
         """Procesamiento específico neural"""
         return {"neural_output": data, "confidence": 0.85}
     
-    async def _perception_processing(self, data: Any) -> Any:
+    def _perception_processing(self, data: Any) -> Any:
         """Procesamiento específico de percepción"""
         return {"perception_result": data, "accuracy": 0.90}
     
-    async def _communication_processing(self, data: Any) -> Any:
+    def _communication_processing(self, data: Any) -> Any:
         """Procesamiento específico de comunicación"""
         return {"message": data, "status": "delivered"}
     
-    async def _intelligence_processing(self, data: Any) -> Any:
+    def _intelligence_processing(self, data: Any) -> Any:
         """Procesamiento específico de inteligencia"""
         return {"analysis": data, "reasoning": "logical_inference"}
     
-    async def _system_processing(self, data: Any) -> Any:
+    def _system_processing(self, data: Any) -> Any:
         """Procesamiento específico de sistema"""
         return {"system_result": data, "health": "optimal"}
     
-    async def _generic_processing(self, data: Any) -> Any:
+    def _generic_processing(self, data: Any) -> Any:
         """Procesamiento genérico"""
         return {"processed": True, "data": data}
     
-    async def _postprocess_result(self, result: Any, context: Dict[str, Any]) -> Any:
+    _PROCESSING_BY_TYPE = {
+        "neural": _neural_processing,
+        "perception": _perception_processing,
+        "communication": _communication_processing,
+        "intelligence": _intelligence_processing,
+        "system": _system_processing
+    }
+    
+    def _postprocess_result(self, result: Any, context: Dict[str, Any]) -> Any:
         """Post-procesamiento de resultados"""
-        await asyncio.sleep(0.001)
         return result
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Métricas de rendimiento avanzadas"""
-        total_operations = len(self.operation_history)
-        successful_operations = sum(1 for op in self.operation_history if op.get("success", False))
+        # Agregados mantenidos en _record_operation: O(1) por consulta
+        total_operations = self._ops_total
+        successful_operations = self._ops_ok
         
         avg_duration = 0
-        if self.operation_history:
-            durations = [op.get("duration", 0) for op in self.operation_history]
-            avg_duration = sum(durations) / len(durations)
+        if total_operations:
+            avg_duration = self._duration_sum / total_operations
         
         return {
             "component": "DecisionEngine",
@@ -204,12 +305,17 @@ class DecisionEngine:
     
     async def optimize_performance(self) -> Dict[str, Any]:
         """Optimización automática de rendimiento"""
-        print(f"🚀 Optimizando rendimiento de DecisionEngine...")
+        # Sin operaciones nuevas desde la última revisión no hay nada que reevaluar
+        if self._ops_total == self._opt_last_checked_count:
+            return {"optimization": "skipped", "timestamp": datetime.now().isoformat()}
+        self._opt_last_checked_count = self._ops_total
+        
+        logger.info("🚀 Optimizando rendimiento de DecisionEngine...")
         
         # Analizar historial de operaciones
-        if self.operation_history:
-            recent_operations = self.operation_history[-100:]  # Últimas 100 operaciones
-            avg_duration = sum(op.get("duration", 0) for op in recent_operations) / len(recent_operations)
+        if self._recent_durations:
+            # Media de las últimas operaciones con suma corrida
+            avg_duration = self._recent_duration_sum / len(self._recent_durations)
             
             # Ajustar configuración basada en rendimiento
             if avg_duration > 0.1:  # Si es lento
@@ -221,30 +327,71 @@ class DecisionEngine:
         """Aplica optimizaciones específicas"""
         # Implementaciones específicas de optimización
         await asyncio.sleep(0.01)
-        print(f"✅ Optimizaciones aplicadas a DecisionEngine")
+        logger.info("✅ Optimizaciones aplicadas a DecisionEngine")
     
-    def save_state(self, filepath: str):
-        """Guarda estado del componente"""
+    async def save_state(self, filepath: str):
+        """Guarda estado del componente (métricas O(1) de los agregados, JSON compacto)"""
         state_data = {
             "config": self.config,
             "status": self.status,
             "performance_metrics": self.get_performance_metrics(),
-            "operation_history": self.operation_history[-50:],  # Últimas 50 operaciones
+            "operation_history": list(islice(self.operation_history, max(0, len(self.operation_history) - 50), None)),  # Últimas 50 operaciones
             "timestamp": datetime.now().isoformat()
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(state_data, f, indent=2, ensure_ascii=False)
-        print(f"💾 Estado guardado: {filepath}")
+        # Serialización y escritura en un hilo: el event loop sigue atendiendo operaciones
+        await asyncio.to_thread(_write_state, filepath, state_data)
+        logger.info("💾 Estado guardado: %s", filepath)
     
-    def load_state(self, filepath: str):
+    async def load_state(self, filepath: str):
         """Carga estado del componente"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            state_data = json.load(f)
+        state_data = await asyncio.to_thread(_read_state, filepath)
         
         self.config = state_data.get("config", {})
-        self.operation_history = state_data.get("operation_history", [])
-        print(f"📥 Estado cargado: {filepath}")
+        # La nueva config puede cambiar el tipo de componente: re-resolver el despacho
+        self._configure_component_type()
+        
+        # Los literales del código ya están internados; los nombres de operación
+        # deserializados no, así que se canonicalizan para compartir una sola copia
+        operations = state_data.get("operation_history", [])
+        for operation in operations:
+            name = operation.get("operation")
+            if type(name) is str:
+                operation["operation"] = sys.intern(name)
+        self._reset_history(operations)
+        logger.info("📥 Estado cargado: %s", filepath)
+
+def _dumps_state(state_data: Dict[str, Any]) -> bytes:
+    """Serializa el estado a JSON compacto en UTF-8 (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.dumps(state_data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(state_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads_state(raw: bytes) -> Dict[str, Any]:
+    """Deserializa el estado (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _write_state(filepath: str, state_data: Dict[str, Any]):
+    """Serializa (orjson o json.dumps compacto con el codificador en C) y escribe el estado"""
+    serialized = _dumps_state(state_data)
+    with open(filepath, 'wb') as f:
+        f.write(serialized)
+
+def _read_state(filepath: str) -> Dict[str, Any]:
+    """Lee y deserializa el estado"""
+    with open(filepath, 'rb') as f:
+        return _loads_state(f.read())
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Event loop uvloop (si está instalado) con eager tasks si están disponibles (Python 3.12+)"""
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        # Las corrutinas que terminan sin esperar E/S se completan en línea
+        loop.set_task_factory(eager_task_factory)
+    return loop
 
 def create_decision_engine(config: Dict[str, Any] = None) -> DecisionEngine:
     """Crea instancia avanzada de DecisionEngine"""
@@ -261,6 +408,18 @@ async def test_decision_engine():
     return result
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     print(f"🔧 JARVIS-FRIDAY DecisionEngine - Sistema independiente")
-    result = asyncio.run(test_decision_engine())
+    if hasattr(asyncio, "Runner"):
+        with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+            result = runner.run(test_decision_engine())
+    else:
+        # Python < 3.11: sin asyncio.Runner, el loop se gestiona a mano
+        loop = _new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(test_decision_engine())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
     print(f"Resultado: {result}")
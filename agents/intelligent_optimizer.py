@@ -8,8 +8,12 @@ import json
 import os
 import time
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Dict, Any, List, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Orden de prioridad para clasificar oportunidades (construido una sola vez)
+_PRIORITY_ORDER = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
 
 @dataclass
 class OptimizationMetric:
@@ -19,6 +23,11 @@ class OptimizationMetric:
     target_value: float
     improvement_needed: float
     priority: str
+    priority_rank: int = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Rango numérico precalculado para ordenar sin búsquedas por comparación
+        self.priority_rank = _PRIORITY_ORDER.get(self.priority, 1)
 
 class StarkIntelligentOptimizer:
     """Optimizador inteligente que mejora continuamente el rendimiento"""
@@ -143,7 +152,7 @@ class StarkIntelligentOptimizer:
         }
         
         # Ordenar por prioridad
-        opportunities.sort(key=lambda x: {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}[x.priority])
+        opportunities.sort(key=attrgetter('priority_rank'))
         
         for opportunity in opportunities:
             try:
@@ -6,6 +6,7 @@ Lanza conversión masiva y eficiente de componentes mock → real
 import asyncio
 import sys
 import os
+from collections import Counter
 from datetime import datetime
 
 # Agregar directorio padre al path para imports
@@ -30,13 +31,11 @@ async def main():
         
         print(f"Componentes mock detectados: {mock_data['total_found']}")
           # Mostrar componentes por prioridad
-        high_priority = [c for c in mock_components if c.get("priority", "MEDIUM") == "HIGH"]
-        medium_priority = [c for c in mock_components if c.get("priority", "MEDIUM") == "MEDIUM"]
-        low_priority = [c for c in mock_components if c.get("priority", "MEDIUM") == "LOW"]
+        priority_counts = Counter(c.get("priority", "MEDIUM") for c in mock_components)
         
-        print(f"• Prioridad ALTA: {len(high_priority)}")
-        print(f"• Prioridad MEDIA: {len(medium_priority)}")
-        print(f"• Prioridad BAJA: {len(low_priority)}")
+        print(f"• Prioridad ALTA: {priority_counts['HIGH']}")
+        print(f"• Prioridad MEDIA: {priority_counts['MEDIUM']}")
+        print(f"• Prioridad BAJA: {priority_counts['LOW']}")
         
         # Confirmar conversión
         response = input(f"\n¿Proceder con conversión masiva de {len(mock_components)} componentes? (s/N): ")
@@ -64,4 +63,15 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop (opcional) reduce la sobrecarga de planificación de tareas del event loop
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    
+    # uvloop.run() solo existe desde uvloop 0.18: su loop se usa vía asyncio.Runner
+    if uvloop is not None:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        asyncio.run(main())
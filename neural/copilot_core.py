@@ -12,7 +12,52 @@ import ast
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Opcional: sin él se usa búsqueda por subcadenas
+
+# Indicadores de componentes mock, en orden de prioridad de reporte
+_MOCK_INDICATORS = (
+    'mock', 'placeholder', 'todo', 'fixme', 'temporary',
+    'stub', 'dummy', 'fake', 'test_only'
+)
+
+
+def _build_mock_automaton():
+    """Construye un autómata Aho-Corasick para buscar todos los indicadores en una pasada"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, indicator in enumerate(_MOCK_INDICATORS):
+        automaton.add_word(indicator, (rank, indicator))
+    automaton.make_automaton()
+    return automaton
+
+
+_MOCK_AUTOMATON = _build_mock_automaton()
+
+# Directorios que no forman parte del código del proyecto
+_SKIP_DIRS = frozenset({
+    '.git', '__pycache__', 'venv', '.venv', 'env', 'node_modules',
+    'site-packages', '.mypy_cache', '.pytest_cache', 'build', 'dist'
+})
+
+
+def _scandir_py(path: str) -> Iterator[os.DirEntry]:
+    """Recorre recursivamente el workspace con os.scandir y produce los archivos .py"""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS and not entry.name.startswith('.'):
+                        yield from _scandir_py(entry.path)
+                elif entry.is_file() and entry.name.endswith('.py'):
+                    yield entry
+    except PermissionError:
+        pass
 
 class CopilotCore:
     """
@@ -40,9 +85,11 @@ class CopilotCore:
         self.context_intelligence = self._initialize_context_intelligence()
         
         # Workspace understanding
+        self._file_cache: Dict[str, Tuple[float, str]] = {}
         self.workspace_map = self._create_comprehensive_workspace_map()
-        self.code_patterns = self._analyze_code_patterns()
-        self.dependency_graph = self._build_dependency_graph()
+        py_files = self._load_py_files()
+        self.code_patterns = self._analyze_code_patterns(py_files)
+        self.dependency_graph = self._build_dependency_graph(py_files)
           # Coordination with other AIs
         self.ai_coordination = {
             'jarvis_status': 'standby',
@@ -191,7 +238,7 @@ class CopilotCore:
         
         return workspace_map
     
-    def _analyze_code_patterns(self) -> Dict[str, Any]:
+    def _analyze_code_patterns(self, py_files: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
         """Analiza patrones de código en el workspace"""
         patterns = {
             'file_types': {},
@@ -203,25 +250,23 @@ class CopilotCore:
         
         try:
             # Analizar archivos Python en el workspace
-            for py_file in self.workspace_path.glob("**/*.py"):
-                if py_file.is_file():
-                    with open(py_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    # Detectar patrones comunes
-                    if 'class ' in content:
-                        patterns['coding_patterns'].append('object_oriented')
-                    if 'def ' in content:
-                        patterns['coding_patterns'].append('functional')
-                    if 'import ' in content:
-                        patterns['coding_patterns'].append('modular')
-                        
-                    # Conteo de tipos de archivo
-                    patterns['file_types']['python'] = patterns['file_types'].get('python', 0) + 1
+            if py_files is None:
+                py_files = self._load_py_files()
+            for _, content in py_files:
+                # Detectar patrones comunes
+                if 'class ' in content:
+                    patterns['coding_patterns'].append('object_oriented')
+                if 'def ' in content:
+                    patterns['coding_patterns'].append('functional')
+                if 'import ' in content:
+                    patterns['coding_patterns'].append('modular')
+                    
+                # Conteo de tipos de archivo
+                patterns['file_types']['python'] = patterns['file_types'].get('python', 0) + 1
                     
-            # Análisis de complejidad
+            # Análisis de complejidad (el conteo ya se hizo en el recorrido anterior)
             patterns['complexity_analysis'] = {
-                'total_files': len(list(self.workspace_path.glob("**/*.py"))),
+                'total_files': patterns['file_types'].get('python', 0),
                 'estimated_complexity': 'medium',
                 'maintenance_score': 0.8
             }
@@ -231,7 +276,7 @@ class CopilotCore:
             
         return patterns
 
-    def _build_dependency_graph(self) -> Dict[str, Any]:
+    def _build_dependency_graph(self, py_files: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
         """Construye grafo de dependencias del workspace"""
         dependency_graph = {
             'nodes': [],
@@ -242,24 +287,46 @@ class CopilotCore:
         
         try:
             # Analizar imports en archivos Python
-            for py_file in self.workspace_path.glob("**/*.py"):
-                if py_file.is_file():
-                    with open(py_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    # Extraer imports
-                    import_lines = [line for line in content.split('\n') if line.strip().startswith('import ') or line.strip().startswith('from ')]
-                    
-                    dependency_graph['nodes'].append({
-                        'file': str(py_file.name),
-                        'imports': len(import_lines)
-                    })
+            if py_files is None:
+                py_files = self._load_py_files()
+            for file_path, content in py_files:
+                # Extraer imports
+                import_lines = [line for line in content.split('\n') if line.strip().startswith('import ') or line.strip().startswith('from ')]
+                
+                dependency_graph['nodes'].append({
+                    'file': os.path.basename(file_path),
+                    'imports': len(import_lines)
+                })
                     
         except Exception as e:
             dependency_graph['error'] = str(e)
             
         return dependency_graph
 
+    def _load_py_files(self) -> List[Tuple[str, str]]:
+        """Lee los archivos .py del workspace, releyendo solo los modificados desde el último escaneo"""
+        py_files = []
+        file_cache = {}
+        
+        for entry in _scandir_py(self.workspace_path):
+            try:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+                cached = self._file_cache.get(entry.path)
+                if cached is not None and cached[0] == mtime:
+                    content = cached[1]
+                else:
+                    with open(entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+            except OSError:
+                continue
+            
+            file_cache[entry.path] = (mtime, content)
+            py_files.append((entry.path, content))
+        
+        # Reemplazar la caché descarta también los archivos eliminados
+        self._file_cache = file_cache
+        return py_files
+
     def optimize_execution(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Optimiza la ejecución de peticiones con inteligencia contextual"""
         optimization = {
@@ -566,68 +633,6 @@ class CopilotCore:
             "Optimize for local execution without network dependencies",            "Cache workspace analysis results"
         ]
     
-    def autonomous_workspace_optimization(self) -> Dict[str, Any]:
-        """Optimización autónoma del workspace"""
-        print("⚡ COPILOT: Initiating autonomous workspace optimization...")
-        
-        optimization_results = {
-            'code_analysis': self._autonomous_code_analysis(),
-            'structure_optimization': self._autonomous_structure_optimization(),
-            'performance_enhancement': self._autonomous_performance_enhancement(),
-            'mock_component_detection': self._autonomous_mock_detection()
-        }
-        
-        return optimization_results
-    
-    def _autonomous_code_analysis(self) -> Dict[str, Any]:
-        """Análisis autónomo de código"""
-        python_files = list(self.workspace_path.rglob("*.py"))
-        
-        analysis = {
-            'total_files': len(python_files),
-            'optimization_opportunities': [],
-            'code_patterns': {}
-        }
-        
-        for file_path in python_files[:5]:  # Analyze first 5 files
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                if 'TODO' in content or 'FIXME' in content:
-                    analysis['optimization_opportunities'].append(str(file_path))
-                    
-            except Exception:
-                continue
-        
-        return analysis
-    
-    def _autonomous_mock_detection(self) -> Dict[str, Any]:
-        """Detección autónoma de componentes mock"""
-        mock_indicators = ['mock', 'placeholder', 'todo', 'fixme', 'temporary']
-        detected_mocks = []
-        
-        for file_path in self.workspace_path.rglob("*.py"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().lower()
-                    
-                for indicator in mock_indicators:
-                    if indicator in content:
-                        detected_mocks.append({
-                            'file': str(file_path),
-                            'indicator': indicator
-                        })
-                        break
-                        
-            except Exception:
-                continue
-        
-        return {
-            'total_mocks_detected': len(detected_mocks),
-            'mock_components': detected_mocks
-        }
-    
     def coordinate_tripartite_ai_system(self, jarvis_core=None, friday_core=None) -> Dict[str, Any]:
         """Coordinación del sistema AI tripartito"""
         print("⚡ COPILOT: Establishing tripartite AI coordination...")
@@ -737,11 +742,14 @@ class CopilotCore:
         """Optimización autónoma del workspace"""
         print("⚡ COPILOT: Initiating autonomous workspace optimization...")
         
+        # Un único escaneo compartido por los análisis de código y de mocks
+        py_files = self._load_py_files()
+        
         optimization_results = {
-            'code_analysis': self._autonomous_code_analysis(),
+            'code_analysis': self._autonomous_code_analysis(py_files),
             'structure_optimization': self._autonomous_structure_optimization(),
             'performance_enhancement': self._autonomous_performance_enhancement(),
-            'mock_component_detection': self._autonomous_mock_detection()
+            'mock_component_detection': self._autonomous_mock_detection(py_files)
         }
         
         # Log optimization in database
@@ -749,9 +757,9 @@ class CopilotCore:
         
         return optimization_results
     
-    def _autonomous_code_analysis(self) -> Dict[str, Any]:
+    def _autonomous_code_analysis(self, py_files: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
         """Análisis autónomo de código"""
-        python_files = list(self.workspace_path.rglob("*.py"))
+        python_files = py_files if py_files is not None else self._load_py_files()
         
         analysis = {
             'total_files': len(python_files),
@@ -760,17 +768,14 @@ class CopilotCore:
             'code_patterns': {}
         }
         
-        for file_path in python_files[:10]:  # Analyze first 10 files
+        for file_path, content in python_files[:10]:  # Analyze first 10 files
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
                 # Basic complexity analysis
                 lines = content.count('\n')
                 functions = content.count('def ')
                 classes = content.count('class ')
                 
-                analysis['complexity_analysis'][str(file_path)] = {
+                analysis['complexity_analysis'][file_path] = {
                     'lines': lines,
                     'functions': functions,
                     'classes': classes,
@@ -779,7 +784,7 @@ class CopilotCore:
                 
                 # Detect optimization opportunities
                 if 'TODO' in content or 'FIXME' in content:
-                    analysis['optimization_opportunities'].append(str(file_path))
+                    analysis['optimization_opportunities'].append(file_path)
                     
             except Exception as e:
                 continue
@@ -804,28 +809,35 @@ class CopilotCore:
             'enhancement_suggestions': self._generate_performance_suggestions()
         }
     
-    def _autonomous_mock_detection(self) -> Dict[str, Any]:
+    def _autonomous_mock_detection(self, py_files: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
         """Detección autónoma de componentes mock"""
-        mock_indicators = [
-            'mock', 'placeholder', 'todo', 'fixme', 'temporary', 
-            'stub', 'dummy', 'fake', 'test_only'
-        ]
-        
         detected_mocks = []
+        if py_files is None:
+            py_files = self._load_py_files()
         
-        for file_path in self.workspace_path.rglob("*.py"):
+        for file_path, content in py_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().lower()
-                    
-                for indicator in mock_indicators:
-                    if indicator in content:
-                        detected_mocks.append({
-                            'file': str(file_path),
-                            'indicator': indicator,
-                            'context': 'detected_in_content'
-                        })
-                        break
+                content = content.lower()
+                
+                if _MOCK_AUTOMATON is not None:
+                    # Una sola pasada lineal con mínimo acumulado (sin lista de coincidencias);
+                    # se reporta el indicador de mayor prioridad y se corta al ver el primero
+                    best = None
+                    for _, match in _MOCK_AUTOMATON.iter(content):
+                        if best is None or match < best:
+                            best = match
+                            if best[0] == 0:
+                                break
+                    indicator = best[1] if best is not None else None
+                else:
+                    indicator = next((i for i in _MOCK_INDICATORS if i in content), None)
+                
+                if indicator is not None:
+                    detected_mocks.append({
+                        'file': file_path,
+                        'indicator': indicator,
+                        'context': 'detected_in_content'
+                    })
                         
             except Exception:
                 continue
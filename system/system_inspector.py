@@ -11,6 +11,36 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import importlib.util
 
+# Indicadores de implementación mock (comparación sin distinguir mayúsculas)
+_MOCK_INDICATORS_LOWER = tuple(indicator.lower() for indicator in (
+    "pass  # TODO",
+    "pass # TODO",
+    "# Mock implementation",
+    "raise NotImplementedError",
+    "return None  # Mock",
+    "print(\"Mock",
+    "# Placeholder",
+    "# MOCK:",
+    "TODO: Implement"
+))
+
+# Indicadores de implementación real (búsqueda literal de subcadenas)
+_REAL_INDICATORS = (
+    "import torch",
+    "import tensorflow",
+    "import numpy",
+    "import cv2",
+    "class.*:",
+    "def.*:",
+    "return .*[^None]",
+    "self.",
+    "try:",
+    "except:",
+    "for.*in",
+    "while.*:",
+    "if.*:"
+)
+
 class StarkSystemInspector:
     """
     Inspector avanzado del sistema STARK
@@ -166,7 +196,8 @@ class StarkSystemInspector:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            file_analysis["lines"] = len(content.splitlines())
+            # Contar saltos de línea sin construir la lista de líneas
+            file_analysis["lines"] = content.count('\n') + (0 if not content or content.endswith('\n') else 1)
             
             # Análisis de código Python
             if file_path.endswith('.py'):
@@ -232,55 +263,26 @@ class StarkSystemInspector:
     
     def _detect_implementation_type(self, content: str) -> str:
         """Detecta si la implementación es mock o real"""
-        # Indicadores de mock
-        mock_indicators = [
-            "pass  # TODO",
-            "pass # TODO", 
-            "# Mock implementation",
-            "raise NotImplementedError",
-            "return None  # Mock",
-            "print(\"Mock",
-            "# Placeholder",
-            "# MOCK:",
-            "TODO: Implement"
-        ]
-        
-        # Indicadores de implementación real - CORREGIDO: escapar el punto correctamente
-        real_indicators = [
-            "import torch",
-            "import tensorflow",
-            "import numpy",
-            "import cv2",
-            "class.*:",
-            "def.*:",
-            "return .*[^None]",
-            r"self\.",  # Escapado correctamente
-            "try:",
-            "except:",
-            "for.*in",
-            "while.*:",
-            "if.*:"
-        ]
-        
         content_lower = content.lower()
         
-        # Contar indicadores mock
-        mock_count = sum(1 for indicator in mock_indicators if indicator.lower() in content_lower)
+        # Contar indicadores mock; basta con superar el umbral para decidir
+        mock_count = 0
+        for indicator in _MOCK_INDICATORS_LOWER:
+            if indicator in content_lower:
+                mock_count += 1
+                if mock_count > 2:
+                    return "mock"
         
-        # Contar indicadores reales
+        # Contar indicadores reales hasta alcanzar el umbral
         real_count = 0
-        for indicator in real_indicators:
-            if indicator == r"self\.":
-                # Verificación especial para self.
-                if "self." in content:
-                    real_count += 1
-            elif indicator in content:
+        for indicator in _REAL_INDICATORS:
+            if indicator in content:
                 real_count += 1
+                if real_count > 3:
+                    break
         
         # Determinar tipo basado en contenido
-        if mock_count > 2:
-            return "mock"
-        elif real_count > 3 and len(content) > 500:
+        if real_count > 3 and len(content) > 500:
             return "real"
         elif "pass" in content and len(content) < 200:
             return "mock"